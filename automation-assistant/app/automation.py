@@ -2,7 +2,7 @@
 
 import logging
 import re
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 import yaml
 from aiohttp import ClientError
@@ -11,6 +11,7 @@ from .ha_client import ha_client
 from .llm.claude import AsyncClaudeClient
 from .models import AutomationResponse, ValidationResponse
 from .prompts import build_modify_user_prompt, build_system_prompt, build_user_prompt
+from .yaml_loader import SafeLoader
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +40,7 @@ def validate_automation_yaml(yaml_content: str) -> ValidationResponse:
     errors = []
 
     try:
-        data = yaml.safe_load(yaml_content)
+        data = yaml.load(yaml_content, Loader=SafeLoader)
 
         if not isinstance(data, dict):
             errors.append("YAML must be a dictionary/mapping")
@@ -115,6 +116,25 @@ class AutomationGenerator:
                 error=str(exc),
             )
 
+    async def generate_stream(self, user_request: str) -> AsyncIterator[str]:
+        """Generate an automation, yielding the LLM response as it streams in.
+
+        Args:
+            user_request: The user's natural language description of the automation.
+
+        Yields:
+            Chunks of the response text.
+        """
+        context = await ha_client.get_full_context()
+        system_prompt = build_system_prompt(context)
+        user_prompt = build_user_prompt(user_request)
+
+        logger.debug("System prompt length: %s", len(system_prompt))
+        logger.debug("User prompt: %s", user_prompt)
+
+        async for chunk in self.llm_client.generate_stream(system_prompt, user_prompt):
+            yield chunk
+
     async def modify(
         self, existing_yaml: str, modification_request: str
     ) -> AutomationResponse:
@@ -227,7 +227,9 @@ class BatchDiagnosisService:
         """Get list of available entity IDs for validation."""
         try:
             states = await ha_client.get_states()
-            return [s.get("entity_id") for s in states if s.get("entity_id")]
+            return [
+                entity_id for s in states if (entity_id := s.get("entity_id"))
+            ]
         except (ClientError, RuntimeError, TimeoutError, ValueError) as exc:
             logger.warning("Could not fetch entity list: %s", exc)
             return None
@@ -254,6 +256,7 @@ class BatchDiagnosisService:
                 "You are a Home Assistant automation expert. Respond only with "
                 "valid JSON.",
                 prompt,
+                cache=True,
             )
 
             # Parse JSON response
@@ -1,7 +1,7 @@
 """Configuration management for the add-on."""
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
@@ -17,6 +17,16 @@ except (OSError, yaml.YAMLError):
     VERSION = "unknown"
 
 
+@dataclass
+class PerformanceConfig:
+    """Caching, concurrency and profiling settings."""
+
+    llm_cache_ttl: float = 300.0
+    fix_cache_ttl: float = 604800.0
+    max_concurrent_llm: int = 5
+    profile_token: str = ""
+
+
 @dataclass
 class Config:
     """Application configuration loaded from environment variables."""
@@ -27,7 +37,7 @@ class Config:
     log_level: str
     supervisor_token: str
     ha_base_url: str = "http://supervisor/core"
-    ha_ws_url: str = "ws://supervisor/core/api/websocket"
+    performance: PerformanceConfig = field(default_factory=PerformanceConfig)
 
     @classmethod
     def from_env(cls) -> "Config":
@@ -38,14 +48,7 @@ class Config:
         long-lived access token from HA.
         """
         ha_url = os.environ.get("HA_URL", "")
-        if ha_url:
-            ha_base_url = ha_url.rstrip("/")
-            ws_url = ha_base_url.replace("http://", "ws://")
-            ws_url = ws_url.replace("https://", "wss://")
-            ha_ws_url = f"{ws_url}/api/websocket"
-        else:
-            ha_base_url = "http://supervisor/core"
-            ha_ws_url = "ws://supervisor/core/api/websocket"
+        ha_base_url = ha_url.rstrip("/") if ha_url else "http://supervisor/core"
 
         return cls(
             claude_api_key=os.environ.get("CLAUDE_API_KEY", ""),
@@ -54,7 +57,12 @@ class Config:
             log_level=os.environ.get("LOG_LEVEL", "info"),
             supervisor_token=os.environ.get("SUPERVISOR_TOKEN", ""),
             ha_base_url=ha_base_url,
-            ha_ws_url=ha_ws_url,
+            performance=PerformanceConfig(
+                llm_cache_ttl=float(os.environ.get("LLM_CACHE_TTL", "300")),
+                fix_cache_ttl=float(os.environ.get("FIX_CACHE_TTL", "604800")),
+                max_concurrent_llm=int(os.environ.get("MAX_CONCURRENT_LLM", "5")),
+                profile_token=os.environ.get("PROFILE_TOKEN", ""),
+            ),
         )
 
     @property
@@ -62,11 +70,22 @@ class Config:
         """Return the Supervisor base URL."""
         return "http://supervisor"
 
+    @property
+    def ha_ws_url(self) -> str:
+        """Return the HA WebSocket API URL."""
+        ws_url = self.ha_base_url.replace("http://", "ws://").replace("https://", "wss://")
+        return f"{ws_url}/api/websocket"
+
     @property
     def is_configured(self) -> bool:
         """Check if the add-on is properly configured."""
         return bool(self.claude_api_key)
 
+    @property
+    def profiling_enabled(self) -> bool:
+        """Check if request profiling has been turned on."""
+        return bool(self.performance.profile_token)
+
     @property
     def doctor_model_or_default(self) -> str:
         """Return the doctor model or fall back to the default model."""
@@ -34,7 +34,7 @@ class DiagnosticStorage(JsonStorageBase):
                 reports = reports[: self.MAX_REPORTS]
 
             data["reports"] = reports
-            self._save_data(data)
+            await self._save_data(data)
             logger.info(
                 "Saved diagnosis report: %s", report.get("run_id", "unknown")
             )
@@ -84,7 +84,7 @@ class DiagnosticStorage(JsonStorageBase):
             original_length = len(reports)
             data["reports"] = [r for r in reports if r.get("run_id") != run_id]
             if len(data["reports"]) < original_length:
-                self._save_data(data)
+                await self._save_data(data)
                 return True
             return False
 
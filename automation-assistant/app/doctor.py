@@ -1,7 +1,7 @@
 """Automation Doctor - diagnoses and analyzes existing automations."""
 
 import logging
-from typing import Any
+from typing import Any, Optional
 
 from aiohttp import ClientError
 
@@ -21,11 +21,15 @@ class AutomationDoctor:
     def __init__(self):
         self.llm_client = AsyncClaudeClient(model=config.doctor_model_or_default)
 
-    async def diagnose(self, automation_id: str) -> DiagnosisResponse:
+    async def diagnose(
+        self, automation_id: str, context: Optional[dict[str, Any]] = None
+    ) -> DiagnosisResponse:
         """Diagnose an automation and provide analysis.
 
         Args:
             automation_id: The ID of the automation to diagnose.
+            context: HA context from get_full_context(), for callers that
+                diagnose several automations against one fetch.
 
         Returns:
             DiagnosisResponse with the analysis and recommendations.
@@ -51,7 +55,8 @@ class AutomationDoctor:
             alias = automation.get("alias", "Unnamed Automation")
 
             # Fetch HA context for entity/service validation
-            context = await ha_client.get_full_context()
+            if context is None:
+                context = await ha_client.get_full_context()
 
             # Build prompts
             system_prompt = build_debug_system_prompt(context)
@@ -64,7 +69,7 @@ class AutomationDoctor:
 
             # Call LLM for analysis
             analysis = await self.llm_client.generate_automation(
-                system_prompt, user_prompt
+                system_prompt, user_prompt, cache=True
             )
 
             return DiagnosisResponse(
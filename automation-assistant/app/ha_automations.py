@@ -1,21 +1,48 @@
 """Reader for Home Assistant automations and traces."""
 
-import json
+import asyncio
 import logging
+import mmap
 import os
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, NamedTuple, Optional
 
 from aiohttp import ClientError
+import orjson
 import yaml
 
 from .ha_client import ha_client
+from .yaml_loader import SafeDumper, SafeLoader
 
 logger = logging.getLogger(__name__)
 
 # Allow overriding config path for local development
 HA_CONFIG_PATH = os.environ.get("HA_CONFIG_PATH", "/config")
 
+# Trace payload keys that hold trigger info directly, in lookup order
+DIRECT_TRIGGER_KEYS = ("trigger", "trigger_data", "trigger_description")
+
+
+class TraceFields(NamedTuple):
+    """Core fields extracted from a trace payload."""
+
+    run_id: str
+    state: Optional[str]
+    timestamp_start: Optional[str]
+    timestamp_finish: Optional[str]
+
+
+class ParsedTrace(NamedTuple):
+    """Compact summary of a single automation trace."""
+
+    run_id: str
+    state: Optional[str]
+    script_execution: Any
+    trigger: Any
+    timestamp_start: Optional[str]
+    timestamp_finish: Optional[str]
+    error: Any
+
 
 class HAAutomationReader:
     """Reads automations and execution traces from Home Assistant config files."""
@@ -25,38 +52,51 @@ class HAAutomationReader:
         self.automations_file = self.config_path / "automations.yaml"
         self.traces_file = self.config_path / ".storage" / "trace.saved_traces"
 
-    def _read_automations_file(self) -> list[dict[str, Any]]:
-        """Read and parse automations.yaml."""
-        if not self.automations_file.exists():
+    def _read_automations_file(self) -> tuple[list[dict[str, Any]], bool]:
+        """Read and parse automations.yaml.
+
+        Returns the parsed automations and whether the file exists, so callers
+        don't need a separate stat() to decide on the API fallback.
+        """
+        try:
+            content = self.automations_file.read_text(encoding="utf-8")
+        except FileNotFoundError:
             logger.warning(
                 "Automations file not found: %s", self.automations_file
             )
-            return []
+            return [], False
+        except OSError as exc:
+            logger.error("Failed to parse automations.yaml: %s", exc)
+            return [], True
         try:
-            content = self.automations_file.read_text(encoding="utf-8")
             if not content.strip():
-                return []
-            automations = yaml.safe_load(content)
-            if automations is None:
-                return []
+                return [], True
+            automations = yaml.load(content, Loader=SafeLoader)
             if isinstance(automations, list):
-                return automations
-            return []
-        except (OSError, yaml.YAMLError) as exc:
+                return automations, True
+            return [], True
+        except yaml.YAMLError as exc:
             logger.error("Failed to parse automations.yaml: %s", exc)
-            return []
+            return [], True
 
     def _read_traces_file(self) -> tuple[dict[str, Any], str]:
-        """Read and parse trace.saved_traces."""
-        if not self.traces_file.exists():
+        """Read and parse trace.saved_traces.
+
+        The file is memory-mapped and handed to orjson as a buffer, so the
+        (potentially multi-MB) contents are never copied into a Python string.
+        """
+        try:
+            with open(self.traces_file, "rb") as handle:
+                if os.fstat(handle.fileno()).st_size == 0:
+                    return {}, "empty_file"
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as view:
+                        return orjson.loads(view), "ok"
+        except FileNotFoundError:
             logger.warning("Traces file not found: %s", self.traces_file)
             return {}, "missing_file"
-        try:
-            content = self.traces_file.read_text(encoding="utf-8")
-            if not content.strip():
-                return {}, "empty_file"
-            return json.loads(content), "ok"
-        except (json.JSONDecodeError, OSError) as exc:
+        except (OSError, ValueError) as exc:
+            # orjson.JSONDecodeError is a ValueError subclass
             logger.error("Failed to parse traces file: %s", exc)
             return {}, "invalid_json"
 
@@ -88,8 +128,20 @@ class HAAutomationReader:
                     return start, finish
         return None, None
 
-    def _extract_timestamp(self, trace: dict[str, Any]) -> tuple[Optional[str], Optional[str]]:
-        """Extract start/finish timestamps from a trace, if present."""
+    @staticmethod
+    def _first_str(trace: dict[str, Any], keys: tuple[str, ...]) -> Optional[str]:
+        """Return the first non-empty string value among keys."""
+        for key in keys:
+            value = trace.get(key)
+            if isinstance(value, str) and value:
+                return value
+        return None
+
+    def _parse_trace_fields(self, trace: dict[str, Any]) -> TraceFields:
+        """Extract run ID, state and start/finish timestamps in a single pass."""
+        run_id = self._first_str(trace, ("run_id", "id", "trace_id")) or ""
+        state = self._first_str(trace, ("state", "status", "result"))
+
         start = None
         finish = None
 
@@ -118,7 +170,7 @@ class HAAutomationReader:
             if isinstance(trace_data, dict):
                 start, finish = self._extract_timestamp_from_trace_data(trace_data)
 
-        return start, finish
+        return TraceFields(run_id, state, start, finish)
 
     def _extract_trigger_from_step(self, step: dict[str, Any]) -> Optional[Any]:
         """Extract trigger info from a step-like payload."""
@@ -147,16 +199,20 @@ class HAAutomationReader:
         return None
 
     def _unwrap_trace_payload(self, trace: dict[str, Any]) -> dict[str, Any]:
-        """Extract the real trace payload when stored under short_dict/extended_dict."""
+        """Extract the real trace payload when stored under short_dict/extended_dict.
+
+        Falls back to the trace itself when there is no usable wrapped payload,
+        so the result is always a dict.
+        """
         payload = trace.get("extended_dict") or trace.get("short_dict")
-        if isinstance(payload, dict):
-            return payload
         if isinstance(payload, str):
             try:
-                return json.loads(payload)
-            except json.JSONDecodeError:
-                return {}
-        return {}
+                payload = orjson.loads(payload)
+            except orjson.JSONDecodeError:
+                return trace
+        if isinstance(payload, dict) and payload:
+            return payload
+        return trace
 
     def _extract_trigger(self, trace: dict[str, Any]) -> Any:
         """Extract trigger info from a trace if not present on the root object."""
@@ -165,13 +221,13 @@ class HAAutomationReader:
             return None
 
         # Direct trigger fields sometimes appear on the trace payload
-        for direct_key in ("trigger", "trigger_data", "trigger_description"):
+        for direct_key in DIRECT_TRIGGER_KEYS:
             if direct_key in trace_data:
-                return trace_data.get(direct_key)
+                return trace_data[direct_key]
 
-        # Look for trigger-like steps in the trace data
+        # Look for trigger-like steps in the trace data (HA uses lowercase step paths)
         for key, steps in trace_data.items():
-            if "trigger" not in str(key).lower():
+            if not (isinstance(key, str) and "trigger" in key):
                 continue
             trigger = self._extract_trigger_from_steps(steps)
             if trigger:
@@ -193,66 +249,22 @@ class HAAutomationReader:
                 return error
         return error
 
-    def _parse_trace_entry(
-        self, trace: dict[str, Any]
-    ) -> tuple[dict[str, Any], dict[str, Any]]:
-        """Parse a trace into a compact summary and stats updates."""
-        payload = self._unwrap_trace_payload(trace)
-        source = payload if payload else trace
-        source_dict = source if isinstance(source, dict) else trace
-
-        trigger = source_dict.get("trigger") if isinstance(source_dict, dict) else None
-        if not trigger:
-            trigger = self._extract_trigger(source_dict)
-
-        state = self._extract_state(source_dict)
-        script_execution = None
-        if isinstance(source_dict, dict):
-            script_execution = source_dict.get("script_execution") or source_dict.get(
-                "script"
-            )
-
-        timestamp_start, timestamp_finish = self._extract_timestamp(source_dict)
-        error = self._extract_trace_error(trace)
-
-        parsed_trace = {
-            "run_id": self._extract_run_id(source_dict),
-            "state": state,
-            "script_execution": script_execution,
-            "trigger": trigger,
-            "timestamp_start": timestamp_start,
-            "timestamp_finish": timestamp_finish,
-            "error": error,
-        }
-
-        stats = {
-            "missing_timestamps": 1 if not timestamp_start else 0,
-            "missing_triggers": 1 if not trigger else 0,
-            "missing_states": 1 if not state and not script_execution else 0,
-            "sample_keys": sorted([str(k) for k in trace.keys()])
-            if isinstance(trace, dict)
-            else [],
-            "sample_payload_keys": sorted([str(k) for k in payload.keys()])
-            if isinstance(payload, dict)
-            else [],
-        }
-        return parsed_trace, stats
-
-    def _extract_state(self, trace: dict[str, Any]) -> Optional[str]:
-        """Extract execution state from a trace if present."""
-        for key in ("state", "status", "result"):
-            value = trace.get(key)
-            if isinstance(value, str) and value:
-                return value
-        return None
-
-    def _extract_run_id(self, trace: dict[str, Any]) -> str:
-        """Extract a run ID from a trace payload if available."""
-        for key in ("run_id", "id", "trace_id"):
-            value = trace.get(key)
-            if isinstance(value, str) and value:
-                return value
-        return ""
+    def _parse_trace_entry(self, trace: dict[str, Any]) -> ParsedTrace:
+        """Parse a trace into a compact summary."""
+        source = self._unwrap_trace_payload(trace)
+        trigger = source.get("trigger") or self._extract_trigger(source)
+        fields = self._parse_trace_fields(source)
+        script_execution = source.get("script_execution") or source.get("script")
+
+        return ParsedTrace(
+            run_id=fields.run_id,
+            state=fields.state,
+            script_execution=script_execution,
+            trigger=trigger,
+            timestamp_start=fields.timestamp_start,
+            timestamp_finish=fields.timestamp_finish,
+            error=self._extract_trace_error(trace),
+        )
 
     def _build_lookup_maps(
         self,
@@ -262,28 +274,27 @@ class HAAutomationReader:
     ) -> dict[str, dict[str, Any]]:
         """Build lookup maps for area/entity/state enrichment."""
         area_map = {area.get("area_id"): area.get("name", "") for area in areas}
-        entity_map = {
-            entity.get("entity_id"): entity
-            for entity in entity_registry
-            if entity.get("entity_id", "").startswith("automation.")
-        }
-        unique_id_map = {
-            entity.get("unique_id"): entity.get("entity_id")
-            for entity in entity_registry
-            if entity.get("entity_id", "").startswith("automation.")
-            and entity.get("unique_id")
-        }
-        state_map = {
-            state.get("entity_id"): state.get("state", "unknown")
-            for state in states
-            if state.get("entity_id", "").startswith("automation.")
-        }
-        state_id_map = {
-            state.get("attributes", {}).get("id"): state.get("entity_id")
-            for state in states
-            if state.get("entity_id", "").startswith("automation.")
-            and state.get("attributes", {}).get("id")
-        }
+        entity_map = {}
+        unique_id_map = {}
+        for entity in entity_registry:
+            entity_id = entity.get("entity_id", "")
+            if not entity_id.startswith("automation."):
+                continue
+            entity_map[entity_id] = entity
+            unique_id = entity.get("unique_id")
+            if unique_id:
+                unique_id_map[unique_id] = entity_id
+
+        state_map = {}
+        state_id_map = {}
+        for state in states:
+            entity_id = state.get("entity_id", "")
+            if not entity_id.startswith("automation."):
+                continue
+            state_map[entity_id] = state.get("state", "unknown")
+            automation_id = state.get("attributes", {}).get("id")
+            if automation_id:
+                state_id_map[automation_id] = entity_id
         return {
             "area_map": area_map,
             "entity_map": entity_map,
@@ -292,16 +303,8 @@ class HAAutomationReader:
             "state_id_map": state_id_map,
         }
 
-    async def list_automations(self) -> list[dict[str, Any]]:
-        """List all automations with basic info including area data and state."""
-        automations = self._read_automations_file()
-
-        # Fall back to API if file doesn't exist (local development)
-        if not automations and not self.automations_file.exists():
-            logger.info("Automations file not found, fetching via API...")
-            automations = await ha_client.list_automations()
-
-        # Fetch entity registry and areas for enrichment
+    async def _fetch_lookup_maps(self) -> dict[str, dict[str, Any]]:
+        """Fetch entity registry, areas and states and build the lookup maps."""
         try:
             entity_registry = await ha_client.get_entity_registry()
             areas = await ha_client.get_areas()
@@ -318,7 +321,18 @@ class HAAutomationReader:
             areas = []
             states = []
 
-        lookup = self._build_lookup_maps(entity_registry, areas, states)
+        return self._build_lookup_maps(entity_registry, areas, states)
+
+    async def list_automations(self) -> list[dict[str, Any]]:
+        """List all automations with basic info including area data and state."""
+        automations, file_exists = self._read_automations_file()
+
+        # Fall back to API if file doesn't exist (local development)
+        if not file_exists:
+            logger.info("Automations file not found, fetching via API...")
+            automations = await ha_client.list_automations()
+
+        lookup = await self._fetch_lookup_maps()
 
         result = []
         for auto in automations:
@@ -360,21 +374,44 @@ class HAAutomationReader:
 
     async def get_automation(self, automation_id: str) -> Optional[dict[str, Any]]:
         """Get a specific automation by ID."""
-        automations = self._read_automations_file()
+        automations, file_exists = self._read_automations_file()
         for auto in automations:
             if auto.get("id") == automation_id:
                 return auto
 
         # Fall back to API if not found in file (local development)
-        if not self.automations_file.exists():
+        if not file_exists:
             return await ha_client.get_automation_config(automation_id)
         return None
 
+    async def get_automations(
+        self, automation_ids: list[str]
+    ) -> dict[str, Optional[dict[str, Any]]]:
+        """Get several automations by ID, parsing automations.yaml only once.
+
+        The file is parsed in a worker thread. Without the file, each ID is
+        fetched from the API concurrently. Missing IDs map to None.
+        """
+        automations, file_exists = await asyncio.to_thread(self._read_automations_file)
+        if not file_exists:
+            configs = await asyncio.gather(
+                *(ha_client.get_automation_config(auto_id) for auto_id in automation_ids)
+            )
+            return dict(zip(automation_ids, configs))
+
+        by_id: dict[str, dict[str, Any]] = {}
+        for auto in automations:
+            # Match get_automation(), which returns the first entry with an ID
+            by_id.setdefault(auto.get("id"), auto)
+        return {auto_id: by_id.get(auto_id) for auto_id in automation_ids}
+
     async def get_automation_yaml(self, automation_id: str) -> Optional[str]:
         """Get automation as YAML string."""
         automation = await self.get_automation(automation_id)
         if automation:
-            return yaml.dump(automation, default_flow_style=False, sort_keys=False)
+            return yaml.dump(
+                automation, Dumper=SafeDumper, default_flow_style=False, sort_keys=False
+            )
         return None
 
     async def get_traces(
@@ -403,12 +440,12 @@ class HAAutomationReader:
             meta["count"] = len(traces)
             return traces, meta
 
-        # Return all traces
-        all_traces = []
-        for entity_id, traces in data.items():
-            for trace in traces:
-                trace["entity_id"] = entity_id
-                all_traces.append(trace)
+        # Return all traces as shallow copies so the parsed file data is not mutated
+        all_traces = [
+            {**trace, "entity_id": entity_id}
+            for entity_id, traces in data.items()
+            for trace in traces
+        ]
         meta["count"] = len(all_traces)
         return all_traces, meta
 
@@ -422,43 +459,50 @@ class HAAutomationReader:
         yaml_content = await self.get_automation_yaml(automation_id)
 
         # Parse traces into a simpler format
-        parsed_traces: list[dict[str, Any]] = []
-        stats = {
-            "missing_timestamps": 0,
-            "missing_triggers": 0,
-            "missing_states": 0,
-            "sample_keys": [],
-            "sample_payload_keys": [],
-        }
+        parsed_traces = [self._parse_trace_entry(trace) for trace in traces]
+
+        # Parse stats only feed the debug log below
+        if traces and logger.isEnabledFor(logging.DEBUG):
+            missing_timestamps = 0
+            missing_triggers = 0
+            missing_states = 0
+            for parsed in parsed_traces:
+                if not parsed.timestamp_start:
+                    missing_timestamps += 1
+                if not parsed.trigger:
+                    missing_triggers += 1
+                if not parsed.state and not parsed.script_execution:
+                    missing_states += 1
+
+            sample_keys: list[str] = []
+            sample_payload_keys: list[str] = []
+            for trace in traces:
+                if not sample_keys and trace:
+                    sample_keys = sorted(str(k) for k in trace.keys())
+                if not sample_payload_keys:
+                    payload = self._unwrap_trace_payload(trace)
+                    if payload is not trace:
+                        sample_payload_keys = sorted(str(k) for k in payload.keys())
+                if sample_keys and sample_payload_keys:
+                    break
 
-        for trace in traces:
-            parsed_trace, updates = self._parse_trace_entry(trace)
-            stats["missing_timestamps"] += updates["missing_timestamps"]
-            stats["missing_triggers"] += updates["missing_triggers"]
-            stats["missing_states"] += updates["missing_states"]
-            if not stats["sample_keys"] and updates["sample_keys"]:
-                stats["sample_keys"] = updates["sample_keys"]
-            if not stats["sample_payload_keys"] and updates["sample_payload_keys"]:
-                stats["sample_payload_keys"] = updates["sample_payload_keys"]
-            parsed_traces.append(parsed_trace)
-
-        if traces:
             logger.debug(
                 "Trace parse summary for %s: %s traces, missing timestamps=%s, "
                 "missing triggers=%s, missing state=%s, sample keys=%s, sample "
                 "payload keys=%s",
                 automation_id,
                 len(traces),
-                stats["missing_timestamps"],
-                stats["missing_triggers"],
-                stats["missing_states"],
-                stats["sample_keys"],
-                stats["sample_payload_keys"],
+                missing_timestamps,
+                missing_triggers,
+                missing_states,
+                sample_keys,
+                sample_payload_keys,
             )
 
         return {
             "automation": automation,
-            "traces": parsed_traces,
+            # Convert to plain dicts for prompt building and JSON responses
+            "traces": [trace._asdict() for trace in parsed_traces],
             "yaml": yaml_content,
             "traces_meta": traces_meta,
         }
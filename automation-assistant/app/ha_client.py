@@ -1,26 +1,149 @@
 """Home Assistant API client using Supervisor API."""
 
 import asyncio
-import json
 import logging
-from typing import Any, Optional
+import time
+from typing import Any, Awaitable, Optional
 
 import aiohttp
+import orjson
 import websockets
 
 from .config import config
 
 logger = logging.getLogger(__name__)
 
+# HA always emits these states in lowercase, so no case folding is needed
+UNAVAILABLE_STATES = frozenset({"unavailable", "unknown"})
+
+
+class HAWebSocket:
+    """Shared, authenticated connection to HA's WebSocket API.
+
+    Commands are matched to their replies by message id, so concurrent
+    commands don't block each other. A dropped connection is reopened by
+    the next command.
+    """
+
+    def __init__(self, token: str):
+        self._token = token
+        # Sent as a text frame; HA's websocket API ignores binary frames
+        self._auth_message = orjson.dumps(
+            {"type": "auth", "access_token": token}
+        ).decode()
+        self._ws: Optional[Any] = None
+        self._lock = asyncio.Lock()
+        self._msg_id = 0
+        self._pending: dict[int, asyncio.Future] = {}
+        self._reader: Optional[asyncio.Task] = None
+
+    async def close(self) -> None:
+        """Close the connection and wait for its reader to finish."""
+        if self._ws is not None:
+            await self._ws.close()
+            self._ws = None
+        if self._reader is not None:
+            await self._reader
+            self._reader = None
+
+    async def _ensure(self) -> Any:
+        """Get the shared WebSocket connection, opening and authenticating it if needed."""
+        async with self._lock:
+            if self._ws is not None:
+                return self._ws
+
+            ws = await websockets.connect(
+                config.ha_ws_url,
+                additional_headers={"Authorization": f"Bearer {self._token}"},
+                max_size=10 * 1024 * 1024,  # 10MB limit for large entity registries
+            )
+            try:
+                # Wait for auth_required message
+                auth_required = await asyncio.wait_for(ws.recv(), timeout=10)
+                logger.debug("Auth required: %s", auth_required)
+
+                # Send auth
+                await ws.send(self._auth_message)
+
+                # Wait for auth_ok
+                auth_result = orjson.loads(await asyncio.wait_for(ws.recv(), timeout=10))
+                logger.debug("Auth result: %s", auth_result)
+                if auth_result.get("type") != "auth_ok":
+                    raise ConnectionError(
+                        f"WebSocket authentication failed: {auth_result.get('message')}"
+                    )
+            except BaseException:
+                await ws.close()
+                raise
+
+            self._ws = ws
+            self._reader = asyncio.create_task(self._read_loop(ws))
+            return ws
+
+    async def _read_loop(self, ws: Any) -> None:
+        """Dispatch incoming WebSocket messages to the commands waiting on them."""
+        try:
+            async for message in ws:
+                try:
+                    data = orjson.loads(message)
+                except orjson.JSONDecodeError as exc:
+                    logger.warning("Ignoring invalid WebSocket message: %s", exc)
+                    continue
+                future = self._pending.pop(data.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(data)
+        except (OSError, websockets.exceptions.WebSocketException) as exc:
+            logger.warning("WebSocket connection lost: %s", exc)
+        finally:
+            # Drop the connection so the next command reconnects, and fail
+            # anything still waiting on a reply from it
+            if self._ws is ws:
+                self._ws = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("WebSocket connection closed"))
+            self._pending.clear()
+
+    async def command(self, command_type: str) -> list[dict[str, Any]]:
+        """Execute a WebSocket command and return the result, or [] on failure."""
+        try:
+            ws = await self._ensure()
+
+            self._msg_id += 1
+            msg_id = self._msg_id
+            future = asyncio.get_running_loop().create_future()
+            self._pending[msg_id] = future
+            try:
+                await ws.send(orjson.dumps({"id": msg_id, "type": command_type}).decode())
+                data = await asyncio.wait_for(future, timeout=30)
+            finally:
+                self._pending.pop(msg_id, None)
+
+            return data.get("result", [])
+
+        except (
+            asyncio.TimeoutError,
+            orjson.JSONDecodeError,
+            OSError,
+            websockets.exceptions.WebSocketException,
+        ) as exc:
+            logger.error("WebSocket command %s failed: %s", command_type, exc)
+            return []
+
 
 class HAClient:
     """Client for interacting with Home Assistant via Supervisor API."""
 
+    # Services and config rarely change, so reuse them for this long
+    CACHE_TTL_SECONDS = 60.0
+
     def __init__(self):
         self.supervisor_url = config.supervisor_base_url
         self.ha_url = config.ha_base_url
         self.token = config.supervisor_token
         self._session: Optional[aiohttp.ClientSession] = None
+        self._cache: dict[str, tuple[float, Any]] = {}
+        self._ws = HAWebSocket(self.token)
 
     @property
     def headers(self) -> dict[str, str]:
@@ -33,90 +156,75 @@ class HAClient:
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create an aiohttp session."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(headers=self.headers)
+            # Every request goes to the same HA host, so keep a healthy number
+            # of idle connections around and cache its DNS lookup
+            connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=32,
+                keepalive_timeout=75,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30, sock_connect=5),
+            )
         return self._session
 
     async def close(self):
-        """Close the HTTP session."""
+        """Close the HTTP session and the WebSocket connection."""
+        await self._ws.close()
         if self._session and not self._session.closed:
             await self._session.close()
 
+    async def _get_json(self, url: str) -> Any:
+        """GET a URL and parse the JSON body with orjson.
+
+        Raises aiohttp.ClientError on HTTP errors and orjson.JSONDecodeError
+        on a malformed body.
+        """
+        session = await self._get_session()
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return orjson.loads(await response.read())
+
+    async def _get_json_cached(self, path: str) -> Any:
+        """Like _get_json, but reuse a recent successful response for the path."""
+        now = time.monotonic()
+        cached = self._cache.get(path)
+        if cached is not None and now - cached[0] < self.CACHE_TTL_SECONDS:
+            return cached[1]
+        data = await self._get_json(f"{self.ha_url}{path}")
+        self._cache[path] = (now, data)
+        return data
+
     async def get_states(self) -> list[dict[str, Any]]:
         """Fetch all entity states from Home Assistant."""
-        session = await self._get_session()
-        url = f"{self.ha_url}/api/states"
         try:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                return await response.json()
-        except aiohttp.ClientError as exc:
+            return await self._get_json(f"{self.ha_url}/api/states")
+        except (aiohttp.ClientError, orjson.JSONDecodeError) as exc:
             logger.error("Failed to fetch states: %s", exc)
             return []
 
     async def get_services(self) -> dict[str, Any]:
         """Fetch available services from Home Assistant."""
-        session = await self._get_session()
-        url = f"{self.ha_url}/api/services"
         try:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                return await response.json()
-        except aiohttp.ClientError as exc:
+            return await self._get_json_cached("/api/services")
+        except (aiohttp.ClientError, orjson.JSONDecodeError) as exc:
             logger.error("Failed to fetch services: %s", exc)
             return {}
 
     async def get_config(self) -> dict[str, Any]:
         """Fetch Home Assistant configuration."""
-        session = await self._get_session()
-        url = f"{self.ha_url}/api/config"
         try:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                return await response.json()
-        except aiohttp.ClientError as exc:
+            return await self._get_json_cached("/api/config")
+        except (aiohttp.ClientError, orjson.JSONDecodeError) as exc:
             logger.error("Failed to fetch config: %s", exc)
             return {}
 
     async def _websocket_command(self, command_type: str) -> list[dict[str, Any]]:
-        """Execute a WebSocket command and return the result."""
-        ws_url = config.ha_ws_url
-
-        try:
-            async with websockets.connect(
-                ws_url,
-                additional_headers={"Authorization": f"Bearer {self.token}"},
-                max_size=10 * 1024 * 1024,  # 10MB limit for large entity registries
-            ) as ws:
-                # Wait for auth_required message
-                auth_required = await asyncio.wait_for(ws.recv(), timeout=10)
-                logger.debug("Auth required: %s", auth_required)
-
-                # Send auth
-                await ws.send(
-                    '{"type": "auth", "access_token": "' + self.token + '"}'
-                )
-
-                # Wait for auth_ok
-                auth_result = await asyncio.wait_for(ws.recv(), timeout=10)
-                logger.debug("Auth result: %s", auth_result)
-
-                # Send command
-                await ws.send(f'{{"id": 1, "type": "{command_type}"}}')
-
-                # Get result
-                result = await asyncio.wait_for(ws.recv(), timeout=30)
-
-                data = json.loads(result)
-                return data.get("result", [])
-
-        except (
-            asyncio.TimeoutError,
-            json.JSONDecodeError,
-            OSError,
-            websockets.exceptions.WebSocketException,
-        ) as exc:
-            logger.error("WebSocket command %s failed: %s", command_type, exc)
-            return []
+        """Execute a WebSocket command over the shared connection."""
+        return await self._ws.command(command_type)
 
     async def get_devices(self) -> list[dict[str, Any]]:
         """Fetch device registry via WebSocket."""
@@ -178,6 +286,7 @@ class HAClient:
             async with session.post(url, json={}) as response:
                 if response.status == 200:
                     logger.info("Automations reloaded successfully")
+                    self._cache.clear()
                     return True
                 logger.error("Failed to reload automations: %s", response.status)
                 return False
@@ -200,14 +309,14 @@ class HAClient:
         try:
             async with session.get(url) as response:
                 if response.status == 200:
-                    return await response.json()
+                    return orjson.loads(await response.read())
                 if response.status == 404:
                     return None
                 logger.error(
                     "Failed to get automation config: %s", response.status
                 )
                 return None
-        except aiohttp.ClientError as exc:
+        except (aiohttp.ClientError, orjson.JSONDecodeError) as exc:
             logger.error("Failed to get automation config: %s", exc)
             return None
 
@@ -249,70 +358,69 @@ class HAClient:
         logger.info("Fetched %s automations via API", len(automations))
         return automations
 
+    @staticmethod
+    async def _fetch_or_default(coro: Awaitable[Any], default: Any, name: str) -> Any:
+        """Await a context fetch, logging and substituting a default on failure.
+
+        Keeps one failing request from cancelling its siblings in a TaskGroup.
+        """
+        try:
+            return await coro
+        except (
+            aiohttp.ClientError, OSError, RuntimeError, TimeoutError, ValueError
+        ) as exc:
+            logger.error("Failed to get %s: %s", name, exc)
+            return default
+
     async def get_full_context(self) -> dict[str, Any]:
         """Fetch all context data from Home Assistant.
 
         Filters out unavailable/disabled entities and devices to ensure
         only active resources are included in the context.
         """
-        # Run all requests concurrently
-        states, services, ha_config, devices, areas, entities = await asyncio.gather(
-            self.get_states(),
-            self.get_services(),
-            self.get_config(),
-            self.get_devices(),
-            self.get_areas(),
-            self.get_entity_registry(),
-            return_exceptions=True,
-        )
-
-        # Handle any exceptions
-        if isinstance(states, Exception):
-            logger.error("Failed to get states: %s", states)
-            states = []
-        if isinstance(services, Exception):
-            logger.error("Failed to get services: %s", services)
-            services = {}
-        if isinstance(ha_config, Exception):
-            logger.error("Failed to get config: %s", ha_config)
-            ha_config = {}
-        if isinstance(devices, Exception):
-            logger.error("Failed to get devices: %s", devices)
-            devices = []
-        if isinstance(areas, Exception):
-            logger.error("Failed to get areas: %s", areas)
-            areas = []
-        if isinstance(entities, Exception):
-            logger.error("Failed to get entity registry: %s", entities)
-            entities = []
-
-        # Filter out unavailable/unknown states
-        unavailable_states = {"unavailable", "unknown"}
+        # Run all requests concurrently. The websocket commands are pipelined
+        # over the shared connection alongside the HTTP requests.
+        fetches = {
+            "states": (self.get_states(), []),
+            "services": (self.get_services(), {}),
+            "config": (self.get_config(), {}),
+            "devices": (self.get_devices(), []),
+            "areas": (self.get_areas(), []),
+            "entity_registry": (self.get_entity_registry(), []),
+        }
+        async with asyncio.TaskGroup() as group:
+            tasks = {
+                name: group.create_task(self._fetch_or_default(coro, default, name))
+                for name, (coro, default) in fetches.items()
+            }
+        results = {name: task.result() for name, task in tasks.items()}
+
+        states = results["states"]
+        devices = results["devices"]
+        entities = results["entity_registry"]
+
+        # Split the entity registry into enabled entries and disabled IDs
+        active_entities = []
+        disabled_entity_ids = set()
+        for entity in entities:
+            if entity.get("disabled_by") is None:
+                active_entities.append(entity)
+            else:
+                disabled_entity_ids.add(entity.get("entity_id"))
+
+        # Filter out unavailable/unknown states and disabled entities
         active_states = [
             state
             for state in states
-            if state.get("state", "").lower() not in unavailable_states
+            if state.get("state") not in UNAVAILABLE_STATES
+            and state.get("entity_id") not in disabled_entity_ids
         ]
         logger.debug(
-            "Filtered states: %s -> %s (removed unavailable/unknown)",
+            "Filtered states: %s -> %s (removed unavailable/unknown/disabled)",
             len(states),
             len(active_states),
         )
 
-        # Get set of disabled entity IDs from registry
-        disabled_entity_ids = {
-            e.get("entity_id")
-            for e in entities
-            if e.get("disabled_by") is not None
-        }
-
-        # Further filter states to remove disabled entities
-        active_states = [
-            s for s in active_states
-            if s.get("entity_id") not in disabled_entity_ids
-        ]
-        logger.debug("After removing disabled entities: %s", len(active_states))
-
         # Filter out disabled devices
         active_devices = [
             device for device in devices if device.get("disabled_by") is None
@@ -323,18 +431,12 @@ class HAClient:
             len(active_devices),
         )
 
-        # Filter entity registry to only include enabled entities
-        active_entities = [
-            e for e in entities
-            if e.get("disabled_by") is None
-        ]
-
         return {
             "states": active_states,
-            "services": services,
-            "config": ha_config,
+            "services": results["services"],
+            "config": results["config"],
             "devices": active_devices,
-            "areas": areas,
+            "areas": results["areas"],
             "entity_registry": active_entities,
         }
 
@@ -1,17 +1,59 @@
 """Storage manager for deduplicated insights from diagnosis runs."""
 
+import asyncio
 import hashlib
 import logging
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from typing import Any, Optional
 
 from .storage_base import JsonStorageBase
 
 logger = logging.getLogger(__name__)
 
+# Fields refreshed from the latest diagnosis when an insight is seen again
+UPDATABLE_FIELDS = ("title", "description", "recommendation")
+
+
+def generate_insight_id(insight: dict[str, Any]) -> str:
+    """Generate unique ID for deduplication.
+
+    The ID is based on:
+    - category (single/multi)
+    - insight_type (error, conflict, etc.)
+    - sorted automation_ids
+    - sorted affected_entities
+    """
+    # The key is "category:type:aid1:aid2:entity1:entity2", joined from
+    # pre-encoded parts and hashed in one call
+    key = b":".join(
+        (
+            insight.get("category", "").encode(),
+            insight.get("insight_type", "").encode(),
+            b":".join(sorted(map(str.encode, insight.get("automation_ids", [])))),
+            b":".join(sorted(map(str.encode, insight.get("affected_entities", [])))),
+        )
+    )
+    return hashlib.blake2b(key, digest_size=8).hexdigest()
+
 
 class InsightsStorage(JsonStorageBase):
-    """Stores deduplicated insights from diagnosis runs."""
+    """Stores deduplicated insights from diagnosis runs.
+
+    Insights are kept in memory after the first load, keyed by insight_id
+    and ordered by last_seen (most recent first). Mutations update the
+    cached index and schedule a single delayed write, so bursts of changes
+    are persisted together. The write happens early once enough changes
+    are pending. If the file is modified by someone else while there are no
+    pending changes, the cache is reloaded.
+    """
+
+    PRETTY_PRINT = False  # Rewritten after every batch of changes; keep it small
+    CACHE_LOADS = False  # The insights index is already the in-memory copy
+    SAVE_DELAY_SECONDS = 1.0
+    SAVE_MAX_PENDING = 50  # Write right away once this many changes are pending
+    RESOLVED_RETENTION_DAYS = 30  # Drop resolved insights not seen for this long
+    MAX_INSIGHTS = 1000  # Keep at most this many, most recently seen first
 
     def __init__(self, storage_dir: str = "/config/automation_assistant"):
         super().__init__(
@@ -19,26 +61,126 @@ class InsightsStorage(JsonStorageBase):
             filename="insights.json",
             default_data={"insights": []},
         )
+        self._index: Optional[OrderedDict[str, dict[str, Any]]] = None
+        # Read-side views derived from the index (the ordered snapshot,
+        # per-category buckets, the unresolved count), dropped on any change
+        self._views: dict[str, Any] = {}
+        self._dirty = False
+        self._pending_changes = 0
+        self._save_now = asyncio.Event()
+        self._save_task: Optional[asyncio.Task] = None
+        self._loaded_mtime: Optional[int] = None
+
+    def _file_mtime(self) -> Optional[int]:
+        """Return the storage file's mtime in nanoseconds, or None if missing."""
+        try:
+            return self.storage_file.stat().st_mtime_ns
+        except OSError:
+            return None
 
-    def _generate_insight_id(self, insight: dict[str, Any]) -> str:
-        """Generate unique ID for deduplication.
+    def _get_index(self) -> OrderedDict[str, dict[str, Any]]:
+        """Return the cached insights index, loading it from disk when needed."""
+        mtime = self._file_mtime()
+        if self._index is not None and not self._dirty and mtime != self._loaded_mtime:
+            logger.info("Insights file changed on disk, reloading")
+            self._index = None
+            self._views.clear()
 
-        The ID is based on:
-        - category (single/multi)
-        - insight_type (error, conflict, etc.)
-        - sorted automation_ids
-        - sorted affected_entities
+        if self._index is None:
+            data = self._load_data()
+            self._loaded_mtime = mtime
+            # Recency order is established once here and then maintained with
+            # move_to_end() on updates. The file is normally already in this
+            # order, which makes this sort linear, but a hand-edited or
+            # restored file is put back in order too.
+            stored = sorted(
+                data.get("insights", []),
+                key=lambda x: x.get("last_seen", ""),
+                reverse=True,
+            )
+            self._index = OrderedDict()
+            migrated = False
+            for insight in stored:
+                # Re-key insights stored with an older ID scheme so they
+                # keep deduplicating against new diagnosis results
+                insight_id = generate_insight_id(insight)
+                if insight.get("insight_id") != insight_id:
+                    insight["insight_id"] = insight_id
+                    migrated = True
+                self._index[insight_id] = insight
+            if migrated:
+                logger.info("Migrated stored insight IDs to the current scheme")
+                self._mark_dirty()
+        return self._index
+
+    def _get_snapshot(self) -> tuple[dict[str, Any], ...]:
+        """Return the insights in order as a tuple rebuilt only after changes.
+
+        Readers iterate the snapshot without taking the lock.
         """
-        automation_ids = sorted(insight.get("automation_ids", []))
-        affected_entities = sorted(insight.get("affected_entities", []))
-
-        key = (
-            f"{insight.get('category', '')}:"
-            f"{insight.get('insight_type', '')}:"
-            f"{':'.join(automation_ids)}:"
-            f"{':'.join(affected_entities)}"
-        )
-        return hashlib.sha256(key.encode()).hexdigest()[:16]
+        index = self._get_index()
+        snapshot = self._views.get("all")
+        if snapshot is None:
+            snapshot = self._views["all"] = tuple(index.values())
+        return snapshot
+
+    def _get_category_snapshot(self, category: str) -> tuple[dict[str, Any], ...]:
+        """Return the snapshot's insights for one category, bucketed once per snapshot."""
+        insights = self._get_snapshot()
+        key = f"category:{category}"
+        bucket = self._views.get(key)
+        if bucket is None:
+            bucket = tuple(i for i in insights if i.get("category") == category)
+            self._views[key] = bucket
+        return bucket
+
+    def _mark_dirty(self) -> None:
+        """Flag the cache as changed and schedule a delayed save."""
+        self._views.clear()
+        self._dirty = True
+        self._pending_changes += 1
+        if self._pending_changes >= self.SAVE_MAX_PENDING:
+            self._save_now.set()
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._delayed_save())
+
+    async def _delayed_save(self) -> None:
+        """Persist the cache once pending mutations have settled."""
+        try:
+            await asyncio.wait_for(self._save_now.wait(), self.SAVE_DELAY_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        # Shielded so flush() cancelling this task can't abandon a write that
+        # is already running in a worker thread
+        await asyncio.shield(self._save_pending())
+
+    async def _save_pending(self) -> None:
+        """Write pending changes under the lock, keeping them dirty on failure."""
+        async with self._lock:
+            try:
+                # Routine saves skip the fsync; flush() makes the data durable
+                await self._write_pending(durable=False)
+            except OSError:
+                # Already logged by _save_data; the data stays dirty for a retry
+                pass
+
+    async def _write_pending(self, durable: bool = True) -> None:
+        """Write the cache to disk if it has unsaved changes."""
+        if self._dirty and self._index is not None:
+            await self._save_data(
+                {"insights": list(self._index.values())}, durable=durable
+            )
+            self._loaded_mtime = self._file_mtime()
+            self._dirty = False
+            self._pending_changes = 0
+            self._save_now.clear()
+
+    async def flush(self) -> None:
+        """Write any pending changes to disk immediately."""
+        if self._save_task is not None and not self._save_task.done():
+            self._save_task.cancel()
+        async with self._lock:
+            await self._write_pending()
 
     async def add_insights(self, insights: list[dict[str, Any]]) -> int:
         """Add insights, updating last_seen for duplicates.
@@ -49,33 +191,28 @@ class InsightsStorage(JsonStorageBase):
             return 0
 
         async with self._lock:
-            data = self._load_data()
-            existing = data.get("insights", [])
-
-            # Build a lookup map for existing insights
-            existing_map = {i.get("insight_id"): i for i in existing}
+            existing_map = self._get_index()
 
             new_count = 0
-            now = datetime.utcnow().isoformat()
+            seen_ids: list[str] = []
+            # One timestamp for the whole batch, shared with the retention pass
+            now_dt = datetime.utcnow()
+            now = now_dt.isoformat()
 
             for insight in insights:
                 # Generate ID for deduplication
-                insight_id = self._generate_insight_id(insight)
+                insight_id = generate_insight_id(insight)
                 insight["insight_id"] = insight_id
+                seen_ids.append(insight_id)
 
-                if insight_id in existing_map:
+                existing = existing_map.get(insight_id)
+                if existing is not None:
                     # Update existing insight's last_seen
-                    existing_map[insight_id]["last_seen"] = now
+                    existing["last_seen"] = now
                     # Also update title/description/recommendation if changed
-                    existing_map[insight_id]["title"] = insight.get(
-                        "title", existing_map[insight_id]["title"]
-                    )
-                    existing_map[insight_id]["description"] = insight.get(
-                        "description", existing_map[insight_id]["description"]
-                    )
-                    existing_map[insight_id]["recommendation"] = insight.get(
-                        "recommendation", existing_map[insight_id]["recommendation"]
-                    )
+                    for field in UPDATABLE_FIELDS:
+                        if field in insight:
+                            existing[field] = insight[field]
                     logger.debug("Updated existing insight: %s", insight_id)
                 else:
                     # Add new insight
@@ -86,13 +223,13 @@ class InsightsStorage(JsonStorageBase):
                     new_count += 1
                     logger.debug("Added new insight: %s", insight_id)
 
-            # Convert back to list, sorted by last_seen descending
-            data["insights"] = sorted(
-                existing_map.values(),
-                key=lambda x: x.get("last_seen", ""),
-                reverse=True,
-            )
-            self._save_data(data)
+            # Everything in this batch was seen just now: move it to the front,
+            # keeping batch order, instead of re-sorting the whole index
+            for insight_id in reversed(seen_ids):
+                existing_map.move_to_end(insight_id, last=False)
+
+            self._apply_retention(existing_map, now_dt)
+            self._mark_dirty()
             logger.info(
                 "Processed %s insights, %s new",
                 len(insights),
@@ -100,16 +237,37 @@ class InsightsStorage(JsonStorageBase):
             )
             return new_count
 
+    def _apply_retention(
+        self, index: OrderedDict[str, dict[str, Any]], now: datetime
+    ) -> None:
+        """Evict stale resolved insights and cap the total number kept."""
+        cutoff = (now - timedelta(days=self.RESOLVED_RETENTION_DAYS)).isoformat()
+        expired_ids = [
+            insight_id
+            for insight_id, insight in index.items()
+            if insight.get("resolved", False) and insight.get("last_seen", "") < cutoff
+        ]
+        for insight_id in expired_ids:
+            del index[insight_id]
+
+        # The index is ordered by last_seen, so the oldest are at the end
+        overflow = len(index) - self.MAX_INSIGHTS
+        for _ in range(max(overflow, 0)):
+            index.popitem(last=True)
+
+        evicted = len(expired_ids) + max(overflow, 0)
+        if evicted:
+            logger.info("Evicted %s old insights", evicted)
+
     async def get_all(self, category: Optional[str] = None) -> list[dict[str, Any]]:
         """Get all insights, optionally filtered by category (single/multi)."""
-        async with self._lock:
-            data = self._load_data()
-            insights = data.get("insights", [])
-
-            if category:
-                insights = [i for i in insights if i.get("category") == category]
+        if category:
+            return list(self._get_category_snapshot(category))
+        return list(self._get_snapshot())
 
-            return insights
+    async def get_by_id(self, insight_id: str) -> Optional[dict[str, Any]]:
+        """Get a single insight by ID."""
+        return self._get_index().get(insight_id)
 
     async def get_single_automation_insights(self) -> list[dict[str, Any]]:
         """Get insights affecting single automations."""
@@ -121,50 +279,51 @@ class InsightsStorage(JsonStorageBase):
 
     async def get_unresolved_count(self) -> int:
         """Get count of unresolved insights."""
-        async with self._lock:
-            data = self._load_data()
-            insights = data.get("insights", [])
-            return sum(1 for i in insights if not i.get("resolved", False))
+        insights = self._get_snapshot()
+        # Cached like the snapshot, so dashboard polls don't rescan every time
+        count = self._views.get("unresolved_count")
+        if count is None:
+            count = sum(1 for i in insights if not i.get("resolved", False))
+            self._views["unresolved_count"] = count
+        return count
 
     async def mark_resolved(self, insight_id: str, resolved: bool = True) -> bool:
         """Mark an insight as resolved/unresolved."""
         async with self._lock:
-            data = self._load_data()
-            insights = data.get("insights", [])
-
-            for insight in insights:
-                if insight.get("insight_id") == insight_id:
-                    insight["resolved"] = resolved
-                    self._save_data(data)
-                    logger.info(
-                        "Marked insight %s as resolved=%s", insight_id, resolved
-                    )
-                    return True
-            return False
+            insight = self._get_index().get(insight_id)
+            if insight is None:
+                return False
+            if insight.get("resolved", False) == resolved:
+                # Nothing changed, so there is nothing to write
+                return True
+            insight["resolved"] = resolved
+            self._mark_dirty()
+            logger.info("Marked insight %s as resolved=%s", insight_id, resolved)
+            return True
 
     async def delete_insight(self, insight_id: str) -> bool:
         """Delete an insight permanently."""
         async with self._lock:
-            data = self._load_data()
-            insights = data.get("insights", [])
-            original_length = len(insights)
-            data["insights"] = [i for i in insights if i.get("insight_id") != insight_id]
-            if len(data["insights"]) < original_length:
-                self._save_data(data)
-                logger.info("Deleted insight: %s", insight_id)
-                return True
-            return False
+            if self._get_index().pop(insight_id, None) is None:
+                return False
+            self._mark_dirty()
+            logger.info("Deleted insight: %s", insight_id)
+            return True
 
     async def clear_resolved(self) -> int:
         """Clear all resolved insights. Returns count of deleted insights."""
         async with self._lock:
-            data = self._load_data()
-            insights = data.get("insights", [])
-            original_length = len(insights)
-            data["insights"] = [i for i in insights if not i.get("resolved", False)]
-            deleted_count = original_length - len(data["insights"])
+            index = self._get_index()
+            resolved_ids = [
+                insight_id
+                for insight_id, insight in index.items()
+                if insight.get("resolved", False)
+            ]
+            for insight_id in resolved_ids:
+                del index[insight_id]
+            deleted_count = len(resolved_ids)
             if deleted_count > 0:
-                self._save_data(data)
+                self._mark_dirty()
                 logger.info("Cleared %s resolved insights", deleted_count)
             return deleted_count
 
@@ -1,6 +1,6 @@
 """LLM client implementations."""
 
 from .base import LLMClient
-from .claude import ClaudeClient
+from .claude import AsyncClaudeClient, ClaudeClient
 
-__all__ = ["LLMClient", "ClaudeClient"]
+__all__ = ["LLMClient", "ClaudeClient", "AsyncClaudeClient"]
@@ -0,0 +1,106 @@
+"""Exact-match cache for LLM responses."""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """TTL + LRU cache of LLM responses keyed by model and exact prompts.
+
+    Identical requests made while one is already in flight wait for that
+    call instead of starting another.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 128):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether caching is turned on."""
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, user_prompt: str) -> str:
+        """Build a cache key from the model and both prompts."""
+        hasher = hashlib.blake2b(digest_size=16)
+        for part in (model, system_prompt, user_prompt):
+            hasher.update(part.encode())
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+
+    def _get(self, key: str) -> Optional[str]:
+        """Return a fresh cached response, dropping it if expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def _set(self, key: str, response: str) -> None:
+        """Store a response, evicting the least recently used entries."""
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[str]]
+    ) -> str:
+        """Return the cached response for key, or compute and cache it."""
+        if not self.enabled:
+            return await compute()
+
+        cached = self._get(key)
+        if cached is not None:
+            logger.debug("LLM response cache hit: %s", key)
+            return cached
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute_and_store(key, compute))
+            task.add_done_callback(_retrieve_exception)
+            # An eager task factory may already have finished it
+            if not task.done():
+                self._in_flight[key] = task
+        # Cancelling one caller must not cancel the call the others wait on
+        return await asyncio.shield(task)
+
+    async def _compute_and_store(
+        self, key: str, compute: Callable[[], Awaitable[str]]
+    ) -> str:
+        """Run compute() and cache its response."""
+        try:
+            response = await compute()
+            self._set(key, response)
+            return response
+        finally:
+            self._in_flight.pop(key, None)
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    """Mark a failed call's error as seen when every caller has gone away."""
+    if not task.cancelled():
+        task.exception()
+
+
+# Shared across client instances, which are created per request
+response_cache = ResponseCache(ttl_seconds=config.performance.llm_cache_ttl)
+
+# Insight fix suggestions only depend on the insight and the automation YAML,
+# so they stay valid until either changes and are kept much longer
+fix_cache = ResponseCache(ttl_seconds=config.performance.fix_cache_ttl, max_entries=64)
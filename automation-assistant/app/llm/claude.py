@@ -1,15 +1,19 @@
 """Claude API client implementation."""
 
+import asyncio
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import anthropic
 
 from ..config import config
 from .base import LLMClient
+from .cache import response_cache
 
 logger = logging.getLogger(__name__)
 
+MAX_TOKENS = 4096
+
 
 class ClaudeClient(LLMClient):
     """Claude API client for automation generation."""
@@ -17,6 +21,7 @@ class ClaudeClient(LLMClient):
     def __init__(self, model: Optional[str] = None):
         self.client = anthropic.Anthropic(api_key=config.claude_api_key)
         self.model = model or config.model
+        self._base_kwargs = {"model": self.model, "max_tokens": MAX_TOKENS}
 
     def get_model(self) -> str:
         """Return the configured model name."""
@@ -35,22 +40,19 @@ class ClaudeClient(LLMClient):
             The generated automation YAML with explanation.
         """
         try:
-            # Use synchronous client in async context
-            # anthropic SDK handles this correctly
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=4096,
+            # The synchronous client blocks for the whole round-trip, so run
+            # it in a worker thread to keep the event loop free
+            message = await asyncio.to_thread(
+                self.client.messages.create,
+                **self._base_kwargs,
                 system=system_prompt,
                 messages=[{"role": "user", "content": user_prompt}],
             )
 
             # Extract text from response
-            response_text = ""
-            for block in message.content:
-                if block.type == "text":
-                    response_text += block.text
-
-            return response_text
+            return "".join(
+                block.text for block in message.content if block.type == "text"
+            )
 
         except anthropic.APIError as exc:
             logger.error("Claude API error: %s", exc)
@@ -58,43 +60,97 @@ class ClaudeClient(LLMClient):
 
 
 class AsyncClaudeClient(LLMClient):
-    """Async Claude API client for automation generation."""
+    """Async Claude API client for automation generation.
+
+    All instances share one Anthropic client, and so one connection pool;
+    the model is only a per-request parameter.
+    """
+
+    _shared_client: Optional[anthropic.AsyncAnthropic] = None
 
     def __init__(self, model: Optional[str] = None):
-        self.client = anthropic.AsyncAnthropic(api_key=config.claude_api_key)
+        self.client = self._get_shared_client()
         self.model = model or config.model
+        self._base_kwargs = {"model": self.model, "max_tokens": MAX_TOKENS}
+
+    @classmethod
+    def _get_shared_client(cls) -> anthropic.AsyncAnthropic:
+        """Return the shared Anthropic client, creating it on first use."""
+        if cls._shared_client is None:
+            cls._shared_client = anthropic.AsyncAnthropic(api_key=config.claude_api_key)
+        return cls._shared_client
+
+    @classmethod
+    async def close_shared_client(cls) -> None:
+        """Close the shared client's connection pool."""
+        if cls._shared_client is not None:
+            await cls._shared_client.close()
+            cls._shared_client = None
 
     def get_model(self) -> str:
         """Return the configured model name."""
         return self.model
 
     async def generate_automation(
-        self, system_prompt: str, user_prompt: str
+        self, system_prompt: str, user_prompt: str, cache: bool = False
     ) -> str:
         """Generate an automation using Claude.
 
         Args:
             system_prompt: The system prompt with context about HA entities/services.
             user_prompt: The user's natural language request.
+            cache: Reuse a recent response to the same prompts. Only for
+                analysis calls; resubmitting a generate request should
+                produce a fresh answer.
 
         Returns:
             The generated automation YAML with explanation.
         """
+        if not cache:
+            return await self._create_message(system_prompt, user_prompt)
+        key = response_cache.make_key(self.model, system_prompt, user_prompt)
+        return await response_cache.get_or_compute(
+            key, lambda: self._create_message(system_prompt, user_prompt)
+        )
+
+    async def _create_message(self, system_prompt: str, user_prompt: str) -> str:
+        """Call the Messages API and return the response text."""
         try:
             message = await self.client.messages.create(
-                model=self.model,
-                max_tokens=4096,
+                **self._base_kwargs,
                 system=system_prompt,
                 messages=[{"role": "user", "content": user_prompt}],
             )
 
             # Extract text from response
-            response_text = ""
-            for block in message.content:
-                if block.type == "text":
-                    response_text += block.text
+            return "".join(
+                block.text for block in message.content if block.type == "text"
+            )
+
+        except anthropic.APIError as exc:
+            logger.error("Claude API error: %s", exc)
+            raise
 
-            return response_text
+    async def generate_stream(
+        self, system_prompt: str, user_prompt: str
+    ) -> AsyncIterator[str]:
+        """Generate an automation using Claude, yielding text as it arrives.
+
+        Args:
+            system_prompt: The system prompt with context about HA entities/services.
+            user_prompt: The user's natural language request.
+
+        Yields:
+            Chunks of the generated response text.
+        """
+        try:
+            async with self.client.messages.stream(
+                **self._base_kwargs,
+                system=system_prompt,
+                messages=[{"role": "user", "content": user_prompt}],
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
 
         except anthropic.APIError as exc:
             logger.error("Claude API error: %s", exc)
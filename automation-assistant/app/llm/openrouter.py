@@ -1,8 +1,10 @@
 """OpenRouter API client implementation (future use)."""
 
 import logging
+from typing import Optional
 
 import aiohttp
+import orjson
 
 from .base import LLMClient
 
@@ -20,11 +22,25 @@ class OpenRouterClient(LLMClient):
         self.api_key = api_key
         self.model = model
         self.base_url = "https://openrouter.ai/api/v1"
+        self._session: Optional[aiohttp.ClientSession] = None
 
     def get_model(self) -> str:
         """Return the configured model name."""
         return self.model
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the shared aiohttp session."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the HTTP session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
     async def generate_automation(
         self, system_prompt: str, user_prompt: str
     ) -> str:
@@ -53,17 +69,17 @@ class OpenRouterClient(LLMClient):
             "max_tokens": 4096,
         }
 
+        session = await self._get_session()
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    return data["choices"][0]["message"]["content"]
-
-        except aiohttp.ClientError as exc:
+            async with session.post(
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+            ) as response:
+                response.raise_for_status()
+                data = orjson.loads(await response.read())
+                return data["choices"][0]["message"]["content"]
+
+        except (aiohttp.ClientError, orjson.JSONDecodeError) as exc:
             logger.error("OpenRouter API error: %s", exc)
             raise
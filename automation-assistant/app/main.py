@@ -1,18 +1,38 @@
 """FastAPI application for Automation Assistant."""
 
+import asyncio
+import hashlib
 import logging
+import os
+import re
+import secrets
+import time
 import uuid
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Optional
 
+import anthropic
+import orjson
 import yaml
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import FileResponse, HTMLResponse
+from aiohttp import ClientError
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
-from .automation import automation_generator, validate_automation_yaml
+try:
+    from pyinstrument import Profiler
+except ImportError:  # Only installed where wheels exist; needed just for PROFILE_TOKEN
+    Profiler = None
+
+from .automation import (
+    automation_generator,
+    extract_yaml_from_response,
+    validate_automation_yaml,
+)
 from .batch_doctor import CancelledException, batch_diagnosis_service
 from .config import VERSION, config
 from .diagnostic_storage import diagnostic_storage
@@ -20,6 +40,7 @@ from .doctor import automation_doctor
 from .ha_automations import ha_automation_reader
 from .ha_client import ha_client
 from .insights_storage import insights_storage
+from .llm.cache import fix_cache
 from .llm.claude import AsyncClaudeClient
 from .models import (
     ApplyFixResponse,
@@ -29,12 +50,12 @@ from .models import (
     ContextSummary,
     DeployAutomationRequest,
     DeployAutomationResponse,
+    DiagnoseBatchRequest,
+    DiagnoseBatchResponse,
     DiagnoseRequest,
     DiagnosisResponse,
     HAAutomationList,
-    HAAutomationSummary,
     HealthResponse,
-    Insight,
     InsightsList,
     ModifyAutomationRequest,
     SaveAutomationRequest,
@@ -45,8 +66,10 @@ from .models import (
     ValidationRequest,
     ValidationResponse,
 )
+from .prompts import FIX_SYSTEM_PROMPT, build_fix_prompt, format_automation_blocks
 from .scheduler import diagnosis_scheduler
 from .storage import storage_manager
+from .yaml_loader import SafeLoader
 
 # Configure logging
 LOG_LEVEL = getattr(logging, config.log_level.upper(), logging.INFO)
@@ -56,6 +79,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Shared by fix requests rather than built per request
+fix_llm_client = AsyncClaudeClient(model=config.doctor_model_or_default)
+
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
@@ -64,6 +90,18 @@ async def lifespan(_app: FastAPI):
     logger.info("Using model: %s", config.model)
     logger.info("Using doctor model: %s", config.doctor_model_or_default)
     logger.info("API key configured: %s", config.is_configured)
+    logger.info("Event loop: %s", type(asyncio.get_running_loop()).__module__)
+
+    # Let tasks that can finish without suspending (e.g. cached lookups) run
+    # to completion immediately instead of waiting for a loop iteration.
+    # eager_task_factory is only available on Python 3.12+.
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        asyncio.get_running_loop().set_task_factory(eager_task_factory)
+
+    # The UI files don't change while the add-on runs, so read index.html
+    # once and serve it from memory
+    _app.state.index_html = _load_index_html()
 
     # Start the diagnosis scheduler
     diagnosis_scheduler.start()
@@ -73,7 +111,9 @@ async def lifespan(_app: FastAPI):
 
     # Cleanup
     diagnosis_scheduler.stop()
+    await insights_storage.flush()
     await ha_client.close()
+    await AsyncClaudeClient.close_shared_client()
     logger.info("Automation Assistant stopped")
 
 
@@ -84,6 +124,59 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+
+def stream_aware_gzip(asgi_app, **options):
+    """Wrap an ASGI app in GZip middleware that skips streaming endpoints.
+
+    Compressing server-sent events would buffer them until enough output
+    accumulates, defeating the point of streaming.
+    """
+    gzip_app = GZipMiddleware(asgi_app, **options)
+
+    async def middleware(scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await asgi_app(scope, receive, send)
+            return
+        await gzip_app(scope, receive, send)
+
+    return middleware
+
+
+# Reports, insights and automation lists are large, repetitive JSON
+app.add_middleware(stream_aware_gzip, minimum_size=1024, compresslevel=5)
+
+
+async def profile_request(request: Request, call_next):
+    """Return a pyinstrument report instead of the response when asked to."""
+    token = request.query_params.get("profile", "")
+    if not secrets.compare_digest(token.encode(), config.performance.profile_token.encode()):
+        return await call_next(request)
+
+    profiler = Profiler(async_mode="enabled")
+    profiler.start()
+    await call_next(request)
+    profiler.stop()
+    return HTMLResponse(profiler.output_html())
+
+
+if config.profiling_enabled:
+    if Profiler is None:
+        logger.warning("PROFILE_TOKEN is set but pyinstrument is not installed")
+    else:
+        app.middleware("http")(profile_request)
+        logger.warning("Request profiling is enabled")
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Static files whose names are content-hashed, so they never change."""
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
 # Mount static files
 # Try to serve from built frontend first, fall back to legacy index.html
 static_path = Path(__file__).parent / "static"
@@ -91,31 +184,107 @@ dist_path = static_path / "dist"
 
 # Mount dist assets if available, otherwise mount static root
 if dist_path.exists():
-    app.mount("/assets", StaticFiles(directory=dist_path / "assets"), name="assets")
+    # Vite puts a content hash in every asset filename, so browsers can cache
+    # them for good; index.html stays no-cache and picks up new hashes
+    app.mount(
+        "/assets", ImmutableStaticFiles(directory=dist_path / "assets"), name="assets"
+    )
 app.mount("/static", StaticFiles(directory=static_path), name="static")
 
 
+def _load_yaml_documents(content: str) -> list[Any]:
+    """Parse every document in a YAML string."""
+    return list(yaml.load_all(content, Loader=SafeLoader))
+
+
+def _etag(body: bytes) -> str:
+    """Return a weak ETag for a response body.
+
+    Weak because the gzip middleware may send the same body in another
+    encoding under the same tag.
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _not_modified(
+    request: Request, etag: str, headers: Optional[dict[str, str]] = None
+) -> Optional[Response]:
+    """Return a 304 response if the client already has this ETag."""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers or {"ETag": etag})
+    return None
+
+
+async def require_api_key() -> None:
+    """Reject the request if no Claude API key is configured."""
+    if not config.is_configured:
+        raise HTTPException(
+            status_code=400,
+            detail="Claude API key not configured. Please configure in add-on settings.",
+        )
+
+
+def _model_response(
+    model: BaseModel, headers: Optional[dict[str, str]] = None
+) -> Response:
+    """Serialize a response model once, bypassing response_model revalidation.
+
+    The route's response_model still documents the schema in OpenAPI.
+    """
+    return Response(
+        content=model.model_dump_json(), media_type="application/json", headers=headers
+    )
+
+
+def _json_response(data: Any, headers: Optional[dict[str, str]] = None) -> Response:
+    """Serialize plain stored data straight to a JSON response.
+
+    Skips jsonable_encoder and response_model validation, which only repeat
+    work for data the app wrote itself.
+    """
+    return Response(
+        content=orjson.dumps(data, default=str),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def _load_index_html() -> Optional[tuple[bytes, dict[str, str]]]:
+    """Read the UI's index.html, returning its bytes and response headers."""
+    # Try built frontend first, then the legacy single-file frontend
+    for index_path in (dist_path / "index.html", static_path / "index.html"):
+        try:
+            content = index_path.read_bytes()
+        except OSError:
+            continue
+        # Browsers must revalidate every time, but an unchanged page costs a 304
+        return content, {"Cache-Control": "no-cache", "ETag": _etag(content)}
+    return None
+
+
+# Set by `make dev`, where a frontend rebuild doesn't restart the server:
+# index.html is then re-read on every request instead of once at startup
+RELOAD_UI = os.environ.get("RELOAD_UI") == "1"
+
+# Responses hold no per-request state, so the fallback page is built once
+ui_not_found_response = HTMLResponse("<h1>Automation Assistant</h1><p>UI not found</p>")
+
+
 @app.get("/", response_class=HTMLResponse)
-async def root():
+async def root(request: Request):
     """Serve the web UI."""
-    # Try built frontend first
-    dist_index = dist_path / "index.html"
-    if dist_index.exists():
-        response = FileResponse(dist_index)
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
-        return response
+    if RELOAD_UI:
+        index_html = _load_index_html()
+    else:
+        index_html = getattr(app.state, "index_html", None)
+    if index_html is None:
+        return ui_not_found_response
 
-    # Fall back to legacy single-file frontend
-    index_path = static_path / "index.html"
-    if index_path.exists():
-        response = FileResponse(index_path)
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
-        return response
-    return HTMLResponse("<h1>Automation Assistant</h1><p>UI not found</p>")
+    content, headers = index_html
+    not_modified = _not_modified(request, headers["ETag"], headers)
+    if not_modified is not None:
+        return not_modified
+    return HTMLResponse(content, headers=headers)
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -133,15 +302,13 @@ async def get_version():
     return {"version": VERSION}
 
 
-@app.post("/api/generate", response_model=AutomationResponse)
+@app.post(
+    "/api/generate",
+    response_model=AutomationResponse,
+    dependencies=[Depends(require_api_key)],
+)
 async def generate_automation(request: AutomationRequest):
     """Generate an automation from natural language."""
-    if not config.is_configured:
-        raise HTTPException(
-            status_code=400,
-            detail="Claude API key not configured. Please configure in add-on settings.",
-        )
-
     logger.info("Generating automation for: %s...", request.prompt[:100])
     result = await automation_generator.generate(request.prompt)
 
@@ -151,15 +318,41 @@ async def generate_automation(request: AutomationRequest):
     return result
 
 
-@app.post("/api/modify", response_model=AutomationResponse)
+@app.post("/api/generate/stream", dependencies=[Depends(require_api_key)])
+async def generate_automation_stream(request: AutomationRequest):
+    """Generate an automation, streaming the response as server-sent events.
+
+    Each text chunk is sent as a ``data`` event. A final ``done`` event carries
+    the extracted YAML, or an ``error`` event is sent if generation fails.
+    """
+    logger.info("Streaming automation for: %s...", request.prompt[:100])
+
+    async def events() -> AsyncIterator[bytes]:
+        parts: list[str] = []
+        try:
+            async for chunk in automation_generator.generate_stream(request.prompt):
+                parts.append(chunk)
+                yield b"data: " + orjson.dumps({"text": chunk}) + b"\n\n"
+        except (
+            anthropic.APIError, ClientError, RuntimeError, TimeoutError, ValueError
+        ) as exc:
+            logger.error("Streaming generation failed: %s", exc)
+            yield b"event: error\ndata: " + orjson.dumps({"error": str(exc)}) + b"\n\n"
+            return
+
+        yaml_content = extract_yaml_from_response("".join(parts))
+        yield b"event: done\ndata: " + orjson.dumps({"yaml_content": yaml_content}) + b"\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post(
+    "/api/modify",
+    response_model=AutomationResponse,
+    dependencies=[Depends(require_api_key)],
+)
 async def modify_automation(request: ModifyAutomationRequest):
     """Modify an existing automation using natural language."""
-    if not config.is_configured:
-        raise HTTPException(
-            status_code=400,
-            detail="Claude API key not configured. Please configure in add-on settings.",
-        )
-
     logger.info("Modifying automation with request: %s...", request.prompt[:100])
     result = await automation_generator.modify(request.existing_yaml, request.prompt)
 
@@ -169,24 +362,64 @@ async def modify_automation(request: ModifyAutomationRequest):
     return result
 
 
+CONTEXT_SUMMARY_TTL_SECONDS = 30.0
+
+
 @app.get("/api/context", response_model=ContextSummary)
-async def get_context():
+async def get_context(request: Request):
     """Get a summary of the available Home Assistant context."""
-    summary = await automation_generator.get_context_summary()
-    return ContextSummary(**summary)
+    # (fetched_at, body, etag), reused briefly so polling skips the HA fetch
+    now = time.monotonic()
+    cached = getattr(app.state, "context_summary", None)
+    if cached is None or now - cached[0] > CONTEXT_SUMMARY_TTL_SECONDS:
+        summary = await automation_generator.get_context_summary()
+        body = ContextSummary(**summary).model_dump_json().encode()
+        cached = (now, body, _etag(body))
+        app.state.context_summary = cached
+
+    _, body, etag = cached
+    headers = {"ETag": etag}
+    not_modified = _not_modified(request, etag, headers)
+    if not_modified is not None:
+        return not_modified
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+VALIDATION_CACHE_SIZE = 128
+
+# The editor revalidates the same text repeatedly, so keep recent results
+validation_cache: OrderedDict[str, ValidationResponse] = OrderedDict()
 
 
 @app.post("/api/validate", response_model=ValidationResponse)
 async def validate_yaml(request: ValidationRequest):
     """Validate automation YAML syntax."""
-    return validate_automation_yaml(request.yaml_content)
+    yaml_content = request.yaml_content
+    result = validation_cache.get(yaml_content)
+    if result is not None:
+        validation_cache.move_to_end(yaml_content)
+        return result
+
+    # Parsing is CPU-bound; keep it off the event loop
+    result = await asyncio.to_thread(validate_automation_yaml, yaml_content)
+    validation_cache[yaml_content] = result
+    while len(validation_cache) > VALIDATION_CACHE_SIZE:
+        validation_cache.popitem(last=False)
+    return result
 
 
 @app.get("/api/automations", response_model=SavedAutomationList)
-async def list_automations():
+async def list_automations(request: Request):
     """List all saved automations."""
     automations = await storage_manager.list()
-    return SavedAutomationList(automations=automations, count=len(automations))
+    body = orjson.dumps(
+        {"automations": automations, "count": len(automations)}, default=str
+    )
+    headers = {"ETag": _etag(body)}
+    not_modified = _not_modified(request, headers["ETag"], headers)
+    if not_modified is not None:
+        return not_modified
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.post("/api/automations", response_model=SavedAutomation)
@@ -199,7 +432,7 @@ async def save_automation(request: SaveAutomationRequest):
             yaml_content=request.yaml_content,
         )
         logger.info("Saved automation: %s", request.name)
-        return SavedAutomation(**automation)
+        return _model_response(SavedAutomation(**automation))
     except OSError as exc:
         logger.error("Failed to save automation: %s", exc)
         raise HTTPException(status_code=500, detail=str(exc)) from exc
@@ -211,7 +444,7 @@ async def get_automation(automation_id: str):
     automation = await storage_manager.get(automation_id)
     if not automation:
         raise HTTPException(status_code=404, detail="Automation not found")
-    return SavedAutomation(**automation)
+    return _model_response(SavedAutomation(**automation))
 
 
 @app.put("/api/automations/{automation_id}", response_model=SavedAutomation)
@@ -225,7 +458,7 @@ async def update_automation(automation_id: str, request: UpdateAutomationRequest
     if not automation:
         raise HTTPException(status_code=404, detail="Automation not found")
     logger.info("Updated automation: %s", automation_id)
-    return SavedAutomation(**automation)
+    return _model_response(SavedAutomation(**automation))
 
 
 @app.delete("/api/automations/{automation_id}")
@@ -249,7 +482,9 @@ async def deploy_automation(request: DeployAutomationRequest):
     """
     # Parse the YAML content
     try:
-        automation_config = yaml.safe_load(request.yaml_content)
+        automation_config = await asyncio.to_thread(
+            yaml.load, request.yaml_content, Loader=SafeLoader
+        )
         if not automation_config:
             raise HTTPException(status_code=400, detail="Empty YAML content")
     except yaml.YAMLError as exc:
@@ -257,19 +492,16 @@ async def deploy_automation(request: DeployAutomationRequest):
             status_code=400, detail=f"Invalid YAML: {exc}"
         ) from exc
 
-    # Extract or generate automation ID
-    automation_id = request.automation_id
-    if not automation_id:
-        # Try to extract from YAML
-        automation_id = automation_config.get("id")
-    if not automation_id:
-        # Generate a new UUID
+    # Take the ID from the request, then the YAML, or generate one
+    automation_id = request.automation_id or automation_config.get("id")
+    if automation_id:
+        # Check if this is a new automation or update
+        existing = await ha_client.get_automation_config(automation_id)
+        is_new = existing is None
+    else:
+        # A freshly generated UUID can't exist in HA yet, so skip the lookup
         automation_id = str(uuid.uuid4())
-        automation_config["id"] = automation_id
-
-    # Check if this is a new automation or update
-    existing = await ha_client.get_automation_config(automation_id)
-    is_new = existing is None
+        is_new = True
 
     # Ensure the ID is set in the config
     automation_config["id"] = automation_id
@@ -307,13 +539,18 @@ async def deploy_automation(request: DeployAutomationRequest):
 # Doctor endpoints
 
 @app.get("/api/ha-automations", response_model=HAAutomationList)
-async def list_ha_automations():
+async def list_ha_automations(request: Request):
     """List all automations from Home Assistant."""
     automations = await automation_doctor.list_automations()
-    return HAAutomationList(
-        automations=[HAAutomationSummary(**a) for a in automations],
-        count=len(automations),
+    # The reader already builds dicts with exactly the summary fields
+    body = orjson.dumps(
+        {"automations": automations, "count": len(automations)}, default=str
     )
+    headers = {"ETag": _etag(body)}
+    not_modified = _not_modified(request, headers["ETag"], headers)
+    if not_modified is not None:
+        return not_modified
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/api/ha-automations/{automation_id}")
@@ -325,15 +562,13 @@ async def get_ha_automation(automation_id: str):
     return details
 
 
-@app.post("/api/doctor/diagnose", response_model=DiagnosisResponse)
+@app.post(
+    "/api/doctor/diagnose",
+    response_model=DiagnosisResponse,
+    dependencies=[Depends(require_api_key)],
+)
 async def diagnose_automation(request: DiagnoseRequest):
     """Diagnose an automation and provide analysis."""
-    if not config.is_configured:
-        raise HTTPException(
-            status_code=400,
-            detail="Claude API key not configured. Please configure in add-on settings.",
-        )
-
     logger.info("Diagnosing automation: %s", request.automation_id)
     result = await automation_doctor.diagnose(request.automation_id)
 
@@ -343,18 +578,55 @@ async def diagnose_automation(request: DiagnoseRequest):
     return result
 
 
+@app.post(
+    "/api/doctor/diagnose-batch",
+    response_model=DiagnoseBatchResponse,
+    dependencies=[Depends(require_api_key)],
+)
+async def diagnose_automations(request: DiagnoseBatchRequest):
+    """Diagnose several automations concurrently."""
+    logger.info("Diagnosing %s automations", len(request.automation_ids))
+    semaphore = asyncio.Semaphore(max(config.performance.max_concurrent_llm, 1))
+    # Every diagnosis validates against the same HA context, so fetch it once
+    context = await ha_client.get_full_context()
+
+    async def diagnose_one(automation_id: str) -> DiagnosisResponse:
+        async with semaphore:
+            try:
+                return await automation_doctor.diagnose(automation_id, context)
+            except anthropic.APIError as exc:
+                # Report it against this automation rather than failing the batch
+                return DiagnosisResponse(
+                    automation_id=automation_id,
+                    automation_alias="Unknown",
+                    automation_yaml="",
+                    analysis="",
+                    success=False,
+                    error=str(exc),
+                )
+
+    results = await asyncio.gather(
+        *(diagnose_one(automation_id) for automation_id in request.automation_ids)
+    )
+    for result in results:
+        if not result.success:
+            logger.error(
+                "Diagnosis of %s failed: %s", result.automation_id, result.error
+            )
+
+    return DiagnoseBatchResponse(results=list(results))
+
+
 # Batch diagnosis endpoints
 
 
-@app.post("/api/doctor/run-batch", response_model=BatchDiagnosisReport)
+@app.post(
+    "/api/doctor/run-batch",
+    response_model=BatchDiagnosisReport,
+    dependencies=[Depends(require_api_key)],
+)
 async def run_batch_diagnosis():
     """Manually trigger batch diagnosis of all automations."""
-    if not config.is_configured:
-        raise HTTPException(
-            status_code=400,
-            detail="Claude API key not configured. Please configure in add-on settings.",
-        )
-
     if batch_diagnosis_service.is_running:
         raise HTTPException(
             status_code=409,
@@ -398,16 +670,30 @@ async def get_diagnosis_status():
 async def list_diagnosis_reports():
     """List all diagnosis reports (summaries only)."""
     reports = await diagnostic_storage.list_reports()
-    return {"reports": reports, "count": len(reports)}
+    return _json_response({"reports": reports, "count": len(reports)})
 
 
 @app.get("/api/doctor/reports/latest")
-async def get_latest_report():
+async def get_latest_report(request: Request):
     """Get the most recent full diagnosis report."""
     report = await diagnostic_storage.get_latest_report()
     if not report:
         raise HTTPException(status_code=404, detail="No diagnosis reports found")
-    return report
+
+    # Saved reports never change, so the body and ETag are built once per run
+    run_id = report.get("run_id")
+    cached = getattr(app.state, "latest_report", None)
+    if cached is None or cached[0] != run_id:
+        body = orjson.dumps(report, default=str)
+        cached = (run_id, body, _etag(body))
+        app.state.latest_report = cached
+
+    _, body, etag = cached
+    headers = {"Cache-Control": "private, no-cache", "ETag": etag}
+    not_modified = _not_modified(request, etag, headers)
+    if not_modified is not None:
+        return not_modified
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/api/doctor/reports/{run_id}")
@@ -416,7 +702,7 @@ async def get_report(run_id: str):
     report = await diagnostic_storage.get_report(run_id)
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
-    return report
+    return _json_response(report)
 
 
 # Schedule endpoints
@@ -459,11 +745,13 @@ async def get_insights():
     multi = await insights_storage.get_multi_automation_insights()
     unresolved = await insights_storage.get_unresolved_count()
 
-    return InsightsList(
-        single_automation=[Insight(**i) for i in single],
-        multi_automation=[Insight(**i) for i in multi],
-        total_count=len(single) + len(multi),
-        unresolved_count=unresolved,
+    return _json_response(
+        {
+            "single_automation": single,
+            "multi_automation": multi,
+            "total_count": len(single) + len(multi),
+            "unresolved_count": unresolved,
+        }
     )
 
 
@@ -471,14 +759,14 @@ async def get_insights():
 async def get_single_insights():
     """Get insights for single automation issues."""
     insights = await insights_storage.get_single_automation_insights()
-    return {"insights": insights, "count": len(insights)}
+    return _json_response({"insights": insights, "count": len(insights)})
 
 
 @app.get("/api/doctor/insights/multi")
 async def get_multi_insights():
     """Get insights for multi-automation conflicts."""
     insights = await insights_storage.get_multi_automation_insights()
-    return {"insights": insights, "count": len(insights)}
+    return _json_response({"insights": insights, "count": len(insights)})
 
 
 @app.put("/api/doctor/insights/{insight_id}/resolve")
@@ -499,70 +787,36 @@ async def delete_insight(insight_id: str):
     return {"success": True, "insight_id": insight_id}
 
 
-@app.post("/api/doctor/insights/{insight_id}/fix")
+@app.post(
+    "/api/doctor/insights/{insight_id}/fix",
+    dependencies=[Depends(require_api_key)],
+)
 async def get_insight_fix(insight_id: str):
     """Get a suggested fix for an insight."""
-    if not config.is_configured:
-        raise HTTPException(
-            status_code=400,
-            detail="Claude API key not configured.",
-        )
-
     # Get the insight
-    all_insights = await insights_storage.get_all()
-    insight = next(
-        (item for item in all_insights if item.get("insight_id") == insight_id),
-        None,
-    )
+    insight = await insights_storage.get_by_id(insight_id)
     if not insight:
         raise HTTPException(status_code=404, detail="Insight not found")
 
     # Get the automation(s) involved
-    automations = []
-    for auto_id in insight.get("automation_ids", []):
-        auto = await ha_automation_reader.get_automation(auto_id)
-        if auto:
-            automations.append(auto)
+    results = await ha_automation_reader.get_automations(
+        insight.get("automation_ids", [])
+    )
+    automations = [auto for auto in results.values() if auto]
 
     if not automations:
         raise HTTPException(
             status_code=404, detail="Could not find the automation(s)"
         )
 
-    # Build prompt for fix suggestion
-    automation_blocks = []
-    for automation in automations:
-        alias = automation.get("alias", "Unnamed")
-        automation_id = automation.get("id")
-        automation_yaml = yaml.dump(
-            automation, default_flow_style=False, sort_keys=False
-        )
-        automation_blocks.append(
-            f"# {alias} (id: {automation_id})\n```yaml\n"
-            f"{automation_yaml}\n```"
-        )
-    automations_yaml = "\n\n".join(automation_blocks)
-
-    prompt = (
-        "Fix this Home Assistant automation issue.\n\n"
-        "## Issue\n"
-        f"**Type:** {insight.get('insight_type', 'unknown')}\n"
-        f"**Title:** {insight.get('title', '')}\n"
-        f"**Description:** {insight.get('description', '')}\n\n"
-        "## Automation(s)\n"
-        f"{automations_yaml}\n\n"
-        "## Your Task\n"
-        "Provide a corrected version of the automation(s) that fixes the issue.\n"
-        "- Return ONLY the corrected YAML, no explanations\n"
-        "- If multiple automations are involved, separate them with ---\n"
-        "- Keep the original id and alias\n"
-        "- Only change what's necessary to fix the issue"
-    )
+    # Build prompt for fix suggestion; dumping is CPU-bound like parsing
+    automations_yaml = await asyncio.to_thread(format_automation_blocks, automations)
+
+    prompt = build_fix_prompt(insight, automations_yaml)
 
-    llm = AsyncClaudeClient(model=config.doctor_model_or_default)
-    fix_suggestion = await llm.generate_automation(
-        "You are a Home Assistant automation expert. Return only valid YAML.",
-        prompt,
+    key = fix_cache.make_key(fix_llm_client.get_model(), FIX_SYSTEM_PROMPT, prompt)
+    fix_suggestion = await fix_cache.get_or_compute(
+        key, lambda: fix_llm_client.generate_automation(FIX_SYSTEM_PROMPT, prompt)
     )
 
     return {
@@ -574,11 +828,56 @@ async def get_insight_fix(insight_id: str):
     }
 
 
+# Markdown code fence markers, optionally tagged as YAML
+CODE_FENCE_RE = re.compile(r"```(?:yaml|yml)?")
+
+
 class ApplyFixRequest(BaseModel):
     """Request model for applying a fix."""
     yaml_content: str
 
 
+async def _changed_fix_documents(
+    documents: list[Any],
+) -> tuple[list[tuple[str, dict[str, Any]]], list[str], list[str]]:
+    """Pick out the fix documents that differ from HA's current config.
+
+    Re-applying a fix often sends YAML identical to what HA already has;
+    those automations need neither a save nor a reload.
+
+    Returns:
+        The changed (automation ID, config) pairs, the IDs that already
+        match HA, and errors for documents without an ID.
+    """
+    errors: list[str] = []
+    pending: list[tuple[str, dict[str, Any]]] = []
+    for doc in documents:
+        if not doc:
+            continue
+
+        automation_id = doc.get("id")
+        if not automation_id:
+            errors.append("Automation missing 'id' field")
+            continue
+
+        # Ensure the ID is in the config
+        doc["id"] = automation_id
+        pending.append((automation_id, doc))
+
+    current = await ha_automation_reader.get_automations(
+        [automation_id for automation_id, _doc in pending]
+    )
+    changed: list[tuple[str, dict[str, Any]]] = []
+    unchanged_ids: list[str] = []
+    for automation_id, doc in pending:
+        if current[automation_id] == doc:
+            unchanged_ids.append(automation_id)
+            logger.info("Fix already applied to automation: %s", automation_id)
+        else:
+            changed.append((automation_id, doc))
+    return changed, unchanged_ids, errors
+
+
 @app.post("/api/doctor/insights/{insight_id}/apply", response_model=ApplyFixResponse)
 async def apply_insight_fix(insight_id: str, request: ApplyFixRequest):
     """Apply a fix suggestion directly to Home Assistant.
@@ -586,26 +885,16 @@ async def apply_insight_fix(insight_id: str, request: ApplyFixRequest):
     Takes the fixed YAML and deploys it to HA, then marks the insight as resolved.
     """
     # Get the insight to know which automation(s) are affected
-    all_insights = await insights_storage.get_all()
-    insight = next(
-        (item for item in all_insights if item.get("insight_id") == insight_id),
-        None,
-    )
+    insight = await insights_storage.get_by_id(insight_id)
     if not insight:
         raise HTTPException(status_code=404, detail="Insight not found")
 
     # Parse the YAML - may contain multiple documents separated by ---
-    yaml_content = request.yaml_content
     # Strip markdown code blocks if present
-    yaml_content = (
-        yaml_content.replace("```yaml", "")
-        .replace("```yml", "")
-        .replace("```", "")
-        .strip()
-    )
+    yaml_content = CODE_FENCE_RE.sub("", request.yaml_content).strip()
 
     try:
-        documents = list(yaml.safe_load_all(yaml_content))
+        documents = await asyncio.to_thread(_load_yaml_documents, yaml_content)
     except yaml.YAMLError as exc:
         raise HTTPException(
             status_code=400, detail=f"Invalid YAML: {exc}"
@@ -614,25 +903,20 @@ async def apply_insight_fix(insight_id: str, request: ApplyFixRequest):
     if not documents:
         raise HTTPException(status_code=400, detail="No automation found in YAML")
 
-    # Deploy each automation
-    deployed_ids: list[str] = []
-    errors: list[str] = []
-
-    for doc in documents:
-        if not doc:
-            continue
-
-        automation_id = doc.get("id")
-        if not automation_id:
-            errors.append("Automation missing 'id' field")
-            continue
-
-        # Ensure the ID is in the config
-        doc["id"] = automation_id
+    changed, deployed_ids, errors = await _changed_fix_documents(documents)
 
-        result = await ha_client.create_or_update_automation(automation_id, doc)
+    # Save them concurrently; the single reload below picks them all up
+    results = await asyncio.gather(
+        *(
+            ha_client.create_or_update_automation(automation_id, doc)
+            for automation_id, doc in changed
+        )
+    )
+    saved = 0
+    for (automation_id, _doc), result in zip(changed, results):
         if result.get("success"):
             deployed_ids.append(automation_id)
+            saved += 1
             logger.info("Applied fix to automation: %s", automation_id)
         else:
             errors.append(
@@ -648,8 +932,7 @@ async def apply_insight_fix(insight_id: str, request: ApplyFixRequest):
         )
 
     # Reload automations
-    reloaded = await ha_client.reload_automations()
-    if not reloaded:
+    if saved and not await ha_client.reload_automations():
         errors.append(
             "Automations saved but reload failed - may require manual reload"
         )
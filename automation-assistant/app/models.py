@@ -162,6 +162,22 @@ class DiagnosisResponse(BaseModel):
     error: Optional[str] = Field(None, description="Error message if diagnosis failed")
 
 
+class DiagnoseBatchRequest(BaseModel):
+    """Request model for diagnosing several automations at once."""
+
+    automation_ids: list[str] = Field(
+        ..., min_length=1, description="IDs of the automations to diagnose"
+    )
+
+
+class DiagnoseBatchResponse(BaseModel):
+    """Response model for diagnosing several automations at once."""
+
+    results: list[DiagnosisResponse] = Field(
+        default_factory=list, description="Diagnoses in request order"
+    )
+
+
 # Batch diagnosis models
 
 
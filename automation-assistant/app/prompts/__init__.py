@@ -8,6 +8,7 @@ from .conflicts import (
     build_single_diagnosis_summary_prompt,
 )
 from .debug import build_debug_system_prompt, build_debug_user_prompt
+from .fix import FIX_SYSTEM_PROMPT, build_fix_prompt, format_automation_blocks
 
 __all__ = [
     "build_system_prompt",
@@ -19,4 +20,7 @@ __all__ = [
     "build_batch_summary_prompt",
     "build_conflict_analysis_prompt",
     "build_single_diagnosis_summary_prompt",
+    "FIX_SYSTEM_PROMPT",
+    "build_fix_prompt",
+    "format_automation_blocks",
 ]
@@ -5,6 +5,8 @@ from typing import Any, Optional
 
 import yaml
 
+from ..yaml_loader import SafeDumper
+
 
 def _append_blueprint_lines(lines: list[str], auto: dict[str, Any]) -> bool:
     """Append blueprint-specific lines when automation uses a blueprint."""
@@ -482,7 +484,9 @@ def build_conflict_analysis_prompt(
     # Format automations YAML
     automations_text = ""
     for auto in automations:
-        auto_yaml = yaml.dump(auto, default_flow_style=False, sort_keys=False)
+        auto_yaml = yaml.dump(
+            auto, Dumper=SafeDumper, default_flow_style=False, sort_keys=False
+        )
         automations_text += (
             f"### {auto.get('alias', 'Unnamed')}\n```yaml\n{auto_yaml}```\n\n"
         )
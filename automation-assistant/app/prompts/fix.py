@@ -0,0 +1,58 @@
+"""Prompt templates for suggesting fixes to diagnosis insights."""
+
+import io
+from typing import Any
+
+import yaml
+
+from ..yaml_loader import SafeDumper
+
+FIX_SYSTEM_PROMPT = "You are a Home Assistant automation expert. Return only valid YAML."
+
+FIX_PROMPT_TEMPLATE = (
+    "Fix this Home Assistant automation issue.\n\n"
+    "## Issue\n"
+    "**Type:** {insight_type}\n"
+    "**Title:** {title}\n"
+    "**Description:** {description}\n\n"
+    "## Automation(s)\n"
+    "{automations_yaml}\n\n"
+    "## Your Task\n"
+    "Provide a corrected version of the automation(s) that fixes the issue.\n"
+    "- Return ONLY the corrected YAML, no explanations\n"
+    "- If multiple automations are involved, separate them with ---\n"
+    "- Keep the original id and alias\n"
+    "- Only change what's necessary to fix the issue"
+)
+
+
+def format_automation_blocks(automations: list[dict[str, Any]]) -> str:
+    """Render automations as titled markdown YAML blocks."""
+    # Dump each automation straight into one buffer rather than building a
+    # string per automation
+    buffer = io.StringIO()
+    for index, automation in enumerate(automations):
+        if index:
+            buffer.write("\n\n")
+        alias = automation.get("alias", "Unnamed")
+        automation_id = automation.get("id")
+        buffer.write(f"# {alias} (id: {automation_id})\n```yaml\n")
+        yaml.dump(
+            automation,
+            buffer,
+            Dumper=SafeDumper,
+            default_flow_style=False,
+            sort_keys=False,
+        )
+        buffer.write("\n```")
+    return buffer.getvalue()
+
+
+def build_fix_prompt(insight: dict[str, Any], automations_yaml: str) -> str:
+    """Build the user prompt asking for a fix to an insight."""
+    return FIX_PROMPT_TEMPLATE.format(
+        insight_type=insight.get("insight_type", "unknown"),
+        title=insight.get("title", ""),
+        description=insight.get("description", ""),
+        automations_yaml=automations_yaml,
+    )
@@ -32,7 +32,7 @@ class StorageManager(JsonStorageBase):
                 "created_at": datetime.utcnow().isoformat(),
             }
             data["automations"].insert(0, automation)
-            self._save_data(data)
+            await self._save_data(data)
             return automation
 
     async def list(self) -> list[dict[str, Any]]:
@@ -62,7 +62,7 @@ class StorageManager(JsonStorageBase):
                 if automation.get("id") != automation_id
             ]
             if len(data["automations"]) < original_length:
-                self._save_data(data)
+                await self._save_data(data)
                 return True
             return False
 
@@ -76,7 +76,7 @@ class StorageManager(JsonStorageBase):
                 if automation.get("id") == automation_id:
                     automation["prompt"] = prompt
                     automation["yaml_content"] = yaml_content
-                    self._save_data(data)
+                    await self._save_data(data)
                     return automation
             return None
 
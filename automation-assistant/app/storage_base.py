@@ -2,22 +2,39 @@
 
 import asyncio
 import copy
-import json
 import logging
+import mmap
+import os
+import tempfile
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# orjson needs no encoder object; these are the only per-format settings
+COMPACT_DUMP_OPTION = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+PRETTY_DUMP_OPTION = COMPACT_DUMP_OPTION | orjson.OPT_INDENT_2
+
 
 class JsonStorageBase:
     """Base class for JSON-backed storage files."""
 
+    # Subclasses that rewrite their file often can turn this off to write
+    # compact JSON instead
+    PRETTY_PRINT = True
+    # Keep the parsed file in memory and reuse it until the file changes.
+    # Subclasses that keep their own in-memory copy turn this off.
+    CACHE_LOADS = True
+
     def __init__(self, storage_dir: str, filename: str, default_data: dict[str, Any]):
         self.storage_dir = Path(storage_dir)
         self.storage_file = self.storage_dir / filename
         self._default_data = default_data
         self._lock = asyncio.Lock()
+        # ((mtime_ns, size), data) of the last load or save
+        self._cached: Optional[tuple[tuple[int, int], dict[str, Any]]] = None
         self._ensure_storage_dir()
 
     def _ensure_storage_dir(self) -> None:
@@ -31,31 +48,97 @@ class JsonStorageBase:
         """Return a fresh copy of the default payload."""
         return copy.deepcopy(self._default_data)
 
+    def _read_json_file(self) -> Any:
+        """Parse the storage file straight from a memory map.
+
+        Avoids copying the whole file into a bytes object before parsing,
+        which matters for the larger report files.
+        """
+        with open(self.storage_file, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                raise ValueError("file is empty")
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return orjson.loads(view)
+
+    def _file_signature(self) -> Optional[tuple[int, int]]:
+        """Return the storage file's (mtime_ns, size), or None if unavailable."""
+        try:
+            stat = self.storage_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
     def _load_data(self) -> dict[str, Any]:
-        """Load data from the JSON file."""
-        if not self.storage_file.exists():
-            return self._default_payload()
+        """Load data from the JSON file.
+
+        With CACHE_LOADS the parsed data is reused while the file's mtime and
+        size are unchanged. Callers get the cached dict itself, so they must
+        hold the lock and save any changes they make to it.
+        """
+        signature = self._file_signature() if self.CACHE_LOADS else None
+        if (
+            signature is not None
+            and self._cached is not None
+            and self._cached[0] == signature
+        ):
+            return self._cached[1]
+
         try:
-            with open(self.storage_file, "r", encoding="utf-8") as handle:
-                data = json.load(handle)
+            data = self._read_json_file()
             if isinstance(data, dict):
+                if signature is not None:
+                    self._cached = (signature, data)
                 return data
             logger.error("Storage file %s did not contain a dict", self.storage_file)
             return self._default_payload()
-        except (OSError, json.JSONDecodeError) as exc:
+        except FileNotFoundError:
+            return self._default_payload()
+        except (OSError, ValueError) as exc:
+            # orjson.JSONDecodeError is a ValueError subclass
             logger.error("Failed to load storage file %s: %s", self.storage_file, exc)
             return self._default_payload()
 
-    def _save_data(self, data: dict[str, Any]) -> None:
-        """Save data to the JSON file."""
+    def _save_data_sync(self, data: dict[str, Any], durable: bool = True) -> None:
+        """Atomically write data to the JSON file.
+
+        Writes to a temporary file and renames it over the storage file, so
+        a crash mid-write never leaves a truncated file behind. With
+        durable=False the fsync is skipped: the rename is still atomic if the
+        process dies, but a power loss may lose the latest write.
+        """
+        tmp_name = None
         try:
             self._ensure_storage_dir()
-            with open(self.storage_file, "w", encoding="utf-8") as handle:
-                json.dump(data, handle, indent=2, default=str)
+            option = PRETTY_DUMP_OPTION if self.PRETTY_PRINT else COMPACT_DUMP_OPTION
+            payload = orjson.dumps(data, option=option, default=str)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.storage_dir, prefix=f"{self.storage_file.name}.", suffix=".tmp"
+            )
+            # mkstemp creates the file as 0600; keep the usual 0644 mode
+            os.fchmod(fd, 0o644)
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(payload)
+                if durable:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+            os.replace(tmp_name, self.storage_file)
         except OSError as exc:
             logger.error("Failed to save storage file %s: %s", self.storage_file, exc)
+            if tmp_name is not None:
+                Path(tmp_name).unlink(missing_ok=True)
+            # The caller may have changed the cached data before this failed
+            self._cached = None
             raise
 
+        if self.CACHE_LOADS:
+            signature = self._file_signature()
+            self._cached = (signature, data) if signature is not None else None
+
+    async def _save_data(self, data: dict[str, Any], durable: bool = True) -> None:
+        """Save data to the JSON file without blocking the event loop."""
+        await asyncio.to_thread(self._save_data_sync, data, durable)
+
     def get_storage_file(self) -> Path:
         """Return the storage file path."""
         return self.storage_file
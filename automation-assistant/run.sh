@@ -5,6 +5,9 @@ export CLAUDE_API_KEY=$(bashio::config 'claude_api_key')
 export MODEL=$(bashio::config 'model')
 export DOCTOR_MODEL=$(bashio::config 'doctor_model')
 export LOG_LEVEL=$(bashio::config 'log_level')
+if bashio::config.has_value 'profile_token'; then
+    export PROFILE_TOKEN=$(bashio::config 'profile_token')
+fi
 
 # Get supervisor token for HA API access
 export SUPERVISOR_TOKEN="${SUPERVISOR_TOKEN}"
@@ -14,6 +17,8 @@ bashio::log.info "Using model: ${MODEL}"
 bashio::log.info "Using doctor model: ${DOCTOR_MODEL}"
 bashio::log.info "Log level: ${LOG_LEVEL}"
 
-# Start the FastAPI server
+# Start the FastAPI server. uvicorn uses uvloop and httptools when they are
+# installed and falls back to asyncio/h11 otherwise. Keep a single worker:
+# the scheduler, caches and pending insight saves live in this process.
 cd /app
 exec python3 -m uvicorn app.main:app --host 0.0.0.0 --port 8099
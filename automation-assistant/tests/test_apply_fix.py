@@ -0,0 +1,59 @@
+"""Tests for skipping fix documents that HA already has."""
+
+import pytest
+
+from app import main
+from app.ha_automations import HAAutomationReader
+
+AUTOMATIONS_YAML = """\
+- id: same
+  alias: Unchanged
+  mode: single
+- id: edited
+  alias: Before
+"""
+
+
+@pytest.fixture
+def reader(monkeypatch, tmp_path):
+    """Point the app's automation reader at a temporary automations.yaml."""
+    (tmp_path / "automations.yaml").write_text(AUTOMATIONS_YAML, encoding="utf-8")
+    ha_reader = HAAutomationReader(config_path=str(tmp_path))
+    monkeypatch.setattr(main, "ha_automation_reader", ha_reader)
+    return ha_reader
+
+
+async def test_splits_changed_and_unchanged_documents(reader):
+    """Only documents that differ from automations.yaml need saving."""
+    documents = [
+        {"id": "same", "alias": "Unchanged", "mode": "single"},
+        {"id": "edited", "alias": "After"},
+        {"id": "new", "alias": "New"},
+        {"alias": "No ID"},
+        None,
+    ]
+
+    changed, unchanged_ids, errors = await main._changed_fix_documents(documents)
+
+    assert [automation_id for automation_id, _doc in changed] == ["edited", "new"]
+    assert unchanged_ids == ["same"]
+    assert errors == ["Automation missing 'id' field"]
+
+
+async def test_reads_automations_file_once(monkeypatch, reader):
+    """Every document is compared against a single parse of the file."""
+    calls = 0
+    read = reader._read_automations_file
+
+    def counting_read():
+        nonlocal calls
+        calls += 1
+        return read()
+
+    monkeypatch.setattr(reader, "_read_automations_file", counting_read)
+
+    await main._changed_fix_documents(
+        [{"id": "same", "alias": "x"}, {"id": "edited", "alias": "y"}]
+    )
+
+    assert calls == 1
@@ -0,0 +1,78 @@
+"""Tests for diagnosing several automations in one request."""
+
+import anthropic
+import httpx
+import pytest
+
+from app import main
+from app.models import DiagnoseBatchRequest, DiagnosisResponse
+
+CONTEXT = {"states": [], "services": {}}
+
+
+@pytest.fixture
+def context_fetches(monkeypatch):
+    """Stub the HA context fetch and count the calls."""
+    calls = []
+
+    async def get_full_context():
+        calls.append(1)
+        return CONTEXT
+
+    monkeypatch.setattr(main.ha_client, "get_full_context", get_full_context)
+    return calls
+
+
+async def test_shares_one_context_fetch(monkeypatch, context_fetches):
+    """The batch fetches HA context once and hands it to every diagnosis."""
+    contexts = []
+
+    async def diagnose(automation_id, context=None):
+        contexts.append(context)
+        return DiagnosisResponse(
+            automation_id=automation_id,
+            automation_alias=automation_id,
+            automation_yaml="",
+            analysis="ok",
+            success=True,
+        )
+
+    monkeypatch.setattr(main.automation_doctor, "diagnose", diagnose)
+
+    response = await main.diagnose_automations(
+        DiagnoseBatchRequest(automation_ids=["a", "b", "c"])
+    )
+
+    assert [result.automation_id for result in response.results] == ["a", "b", "c"]
+    assert len(context_fetches) == 1
+    assert contexts == [CONTEXT] * 3
+
+
+async def test_api_error_fails_only_its_automation(monkeypatch, context_fetches):
+    """An Anthropic API error is reported against one automation, not the batch."""
+
+    async def diagnose(automation_id, context=None):
+        if automation_id == "bad":
+            raise anthropic.APIConnectionError(
+                request=httpx.Request("POST", "https://api.anthropic.com")
+            )
+        return DiagnosisResponse(
+            automation_id=automation_id,
+            automation_alias=automation_id,
+            automation_yaml="",
+            analysis="ok",
+            success=True,
+        )
+
+    monkeypatch.setattr(main.automation_doctor, "diagnose", diagnose)
+
+    response = await main.diagnose_automations(
+        DiagnoseBatchRequest(automation_ids=["good", "bad"])
+    )
+
+    assert [(r.automation_id, r.success) for r in response.results] == [
+        ("good", True),
+        ("bad", False),
+    ]
+    assert response.results[1].error
+    assert len(context_fetches) == 1
@@ -0,0 +1,98 @@
+"""Tests for ETag revalidation on the polled read endpoints."""
+
+import httpx
+import pytest
+
+from app import main
+
+
+@pytest.fixture
+async def client(monkeypatch):
+    """An HTTP client for the app, with the per-app response caches cleared."""
+    for name in ("context_summary", "latest_report"):
+        monkeypatch.delattr(main.app.state, name, raising=False)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+
+
+async def assert_revalidates(client, path: str) -> str:
+    """Fetch path, check a repeat with its ETag gets a 304, and return the ETag."""
+    response = await client.get(path)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    repeat = await client.get(path, headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert repeat.headers["etag"] == etag
+    return etag
+
+
+async def test_ha_automations_etag_follows_content(monkeypatch, client):
+    """A changed automation list gets a new ETag and a full response."""
+    automations = [{"id": "a", "alias": "A"}]
+
+    async def list_automations():
+        return automations
+
+    monkeypatch.setattr(main.automation_doctor, "list_automations", list_automations)
+
+    etag = await assert_revalidates(client, "/api/ha-automations")
+
+    automations.append({"id": "b", "alias": "B"})
+    response = await client.get("/api/ha-automations", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["count"] == 2
+    assert response.headers["etag"] != etag
+
+
+async def test_context_summary_is_cached_briefly(monkeypatch, client):
+    """Polling within the TTL reuses one HA fetch and revalidates with a 304."""
+    calls = []
+
+    async def get_context_summary():
+        calls.append(1)
+        return {"entity_count": 1, "device_count": 0, "area_count": 0, "service_count": 0}
+
+    monkeypatch.setattr(
+        main.automation_generator, "get_context_summary", get_context_summary
+    )
+
+    await assert_revalidates(client, "/api/context")
+
+    assert len(calls) == 1
+
+
+async def test_saved_automations_etag(monkeypatch, client):
+    """The saved automations list answers a matching If-None-Match with a 304."""
+
+    async def list_saved():
+        return [{"id": "saved", "name": "Saved"}]
+
+    monkeypatch.setattr(main.storage_manager, "list", list_saved)
+
+    await assert_revalidates(client, "/api/automations")
+
+
+async def test_latest_report_body_is_built_once_per_run(monkeypatch, client):
+    """The latest report is serialized once per run ID and revalidates with a 304."""
+    report = {"run_id": "run-1", "results": []}
+
+    async def get_latest_report():
+        return report
+
+    monkeypatch.setattr(main.diagnostic_storage, "get_latest_report", get_latest_report)
+
+    etag = await assert_revalidates(client, "/api/doctor/reports/latest")
+    cached = main.app.state.latest_report
+    await client.get("/api/doctor/reports/latest")
+    assert main.app.state.latest_report is cached
+
+    report = {"run_id": "run-2", "results": []}
+    response = await client.get(
+        "/api/doctor/reports/latest", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["run_id"] == "run-2"
@@ -0,0 +1,178 @@
+"""Tests for reading automations and traces from HA's config directory."""
+
+import orjson
+import pytest
+
+from app import ha_automations
+from app.ha_automations import HAAutomationReader
+
+AUTOMATIONS_YAML = """\
+- id: first
+  alias: First
+- id: second
+  alias: Second
+- id: first
+  alias: Duplicate
+"""
+
+
+@pytest.fixture
+def reader(tmp_path):
+    """A reader over an empty temporary config directory."""
+    return HAAutomationReader(config_path=str(tmp_path))
+
+
+async def test_get_automations_reads_file_once(reader):
+    """IDs are picked out of one parse, first entry winning like get_automation."""
+    reader.automations_file.write_text(AUTOMATIONS_YAML, encoding="utf-8")
+
+    result = await reader.get_automations(["second", "first", "missing"])
+
+    assert result == {
+        "second": {"id": "second", "alias": "Second"},
+        "first": {"id": "first", "alias": "First"},
+        "missing": None,
+    }
+    assert result["first"] == await reader.get_automation("first")
+
+
+async def test_get_automations_falls_back_to_api(monkeypatch, reader):
+    """Without automations.yaml each ID is fetched from HA."""
+    requested = []
+
+    async def get_automation_config(automation_id):
+        requested.append(automation_id)
+        return {"id": automation_id} if automation_id != "missing" else None
+
+    monkeypatch.setattr(
+        ha_automations.ha_client, "get_automation_config", get_automation_config
+    )
+
+    result = await reader.get_automations(["a", "missing"])
+
+    assert result == {"a": {"id": "a"}, "missing": None}
+    assert sorted(requested) == ["a", "missing"]
+
+
+async def test_list_automations_without_enrichment_data(monkeypatch, reader):
+    """With no registry or state data every automation gets the bare summary."""
+    reader.automations_file.write_text(AUTOMATIONS_YAML, encoding="utf-8")
+
+    async def empty():
+        return []
+
+    for name in ("get_entity_registry", "get_areas", "get_states"):
+        monkeypatch.setattr(ha_automations.ha_client, name, empty)
+
+    result = await reader.list_automations()
+
+    assert result[0] == {
+        "id": "first",
+        "alias": "First",
+        "description": "",
+        "mode": "single",
+        "area_id": None,
+        "area_name": None,
+        "state": "unknown",
+    }
+    assert [auto["id"] for auto in result] == ["first", "second", "first"]
+
+
+def test_unwrap_trace_payload(reader):
+    """Wrapped payloads are returned as dicts, falling back to the trace itself."""
+    inner = {"run_id": "abc", "state": "stopped"}
+
+    assert reader._unwrap_trace_payload({"extended_dict": inner}) == inner
+    assert reader._unwrap_trace_payload({"short_dict": inner}) == inner
+    assert reader._unwrap_trace_payload(
+        {"extended_dict": {}, "short_dict": inner}
+    ) == inner
+    assert reader._unwrap_trace_payload({"short_dict": '{"run_id": "abc"}'}) == {
+        "run_id": "abc"
+    }
+
+    for trace in ({"short_dict": "not json"}, {"short_dict": "[1]"}, {"run_id": "x"}):
+        assert reader._unwrap_trace_payload(trace) is trace
+
+
+def test_trigger_lookup(reader):
+    """Direct trigger keys win, then lowercase step paths containing "trigger"."""
+    assert reader._extract_trigger(
+        {"trace": {"trigger_data": {"platform": "state"}, "trigger/0": []}}
+    ) == {"platform": "state"}
+
+    step = {"description": "state of light.kitchen", "platform": "state"}
+    assert reader._extract_trigger({"trace": {"trigger/0": [step]}}) == {
+        "description": "state of light.kitchen",
+        "platform": "state",
+        "entity_id": None,
+    }
+
+    # HA writes step paths in lowercase, so the match is case-sensitive
+    assert reader._extract_trigger({"trace": {"Trigger/0": [step]}}) is None
+    assert reader._extract_trigger({"trace": "not a dict"}) is None
+
+
+def test_parse_trace_entry(reader):
+    """Fields come from the unwrapped payload, skipping empty and non-string values."""
+    trace = {
+        "extended_dict": {
+            "run_id": "",
+            "id": 7,
+            "trace_id": "run-1",
+            "state": None,
+            "status": "stopped",
+            "timestamp": {"start": "2024-01-01T00:00:00", "finish": "2024-01-01T00:00:01"},
+            "trigger": "state of light.kitchen",
+            "script_execution": "finished",
+        }
+    }
+
+    assert reader._parse_trace_entry(trace) == ha_automations.ParsedTrace(
+        run_id="run-1",
+        state="stopped",
+        script_execution="finished",
+        trigger="state of light.kitchen",
+        timestamp_start="2024-01-01T00:00:00",
+        timestamp_finish="2024-01-01T00:00:01",
+        error=None,
+    )
+
+
+async def test_get_traces_reads_file(reader):
+    """The traces file is parsed and filtered, and listing all does not mutate it."""
+    reader.traces_file.parent.mkdir()
+    reader.traces_file.write_bytes(
+        orjson.dumps(
+            {
+                "data": {
+                    "automation.first": [{"run_id": "1"}],
+                    "automation.second": [{"run_id": "2"}],
+                }
+            }
+        )
+    )
+
+    traces, meta = await reader.get_traces("first")
+    assert traces == [{"run_id": "1"}]
+    assert meta["status"] == "ok" and meta["count"] == 1
+
+    traces, meta = await reader.get_traces()
+    assert traces == [
+        {"run_id": "1", "entity_id": "automation.first"},
+        {"run_id": "2", "entity_id": "automation.second"},
+    ]
+    assert (await reader.get_traces("first"))[0] == [{"run_id": "1"}]
+
+
+@pytest.mark.parametrize(
+    ("content", "status"),
+    [(None, "missing_file"), (b"", "empty_file"), (b"{not json", "invalid_json")],
+)
+def test_read_traces_file_status(reader, content, status):
+    """Missing, empty and malformed trace files are reported, not raised."""
+    if content is not None:
+        reader.traces_file.parent.mkdir()
+        reader.traces_file.write_bytes(content)
+
+    assert reader._read_traces_file() == ({}, status)
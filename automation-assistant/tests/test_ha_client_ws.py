@@ -0,0 +1,128 @@
+"""Tests for the HA client's shared WebSocket connection."""
+
+import asyncio
+from typing import Any
+
+import orjson
+import pytest
+from websockets.asyncio.server import serve
+
+from app.config import config
+from app.ha_client import HAClient
+
+TOKEN = "test-token"
+
+
+class FakeHAServer:
+    """Minimal HA WebSocket API: auth handshake, then echo each command.
+
+    Commands named "slow" are answered after the ones sent behind them, and
+    "drop" closes the connection without a reply.
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self.commands: list[str] = []
+
+    async def handler(self, ws: Any) -> None:
+        """Serve one client connection."""
+        self.connections += 1
+        await ws.send(orjson.dumps({"type": "auth_required"}).decode())
+        auth = orjson.loads(await ws.recv())
+        if auth.get("access_token") != TOKEN:
+            await ws.send(
+                orjson.dumps({"type": "auth_invalid", "message": "Bad token"}).decode()
+            )
+            return
+        await ws.send(orjson.dumps({"type": "auth_ok"}).decode())
+
+        async for message in ws:
+            data = orjson.loads(message)
+            self.commands.append(data["type"])
+            if data["type"] == "drop":
+                await ws.close()
+                return
+            if data["type"] == "slow":
+                asyncio.create_task(self._reply_later(ws, data))
+                continue
+            await self._reply(ws, data)
+
+    @staticmethod
+    async def _reply(ws: Any, data: dict[str, Any]) -> None:
+        """Send a result carrying the command type back."""
+        await ws.send(
+            orjson.dumps(
+                {
+                    "id": data["id"],
+                    "type": "result",
+                    "success": True,
+                    "result": [{"command": data["type"]}],
+                }
+            ).decode()
+        )
+
+    async def _reply_later(self, ws: Any, data: dict[str, Any]) -> None:
+        """Reply after the commands queued behind this one."""
+        await asyncio.sleep(0.05)
+        await self._reply(ws, data)
+
+
+@pytest.fixture
+async def server(monkeypatch):
+    """Run a fake HA server and point the config at it."""
+    fake = FakeHAServer()
+    async with serve(fake.handler, "127.0.0.1", 0) as ws_server:
+        port = ws_server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(config, "ha_base_url", f"http://127.0.0.1:{port}")
+        yield fake
+
+
+@pytest.fixture
+async def client(monkeypatch, server):
+    """An HAClient authenticated with the fake server's token."""
+    monkeypatch.setattr(config, "supervisor_token", TOKEN)
+    ha = HAClient()
+    yield ha
+    await ha.close()
+
+
+async def test_concurrent_commands_share_one_connection(client, server):
+    """Replies are matched by id even when they arrive out of order."""
+    results = await asyncio.gather(
+        client._websocket_command("slow"),
+        client._websocket_command("fast"),
+        client._websocket_command("other"),
+    )
+
+    assert results == [
+        [{"command": "slow"}],
+        [{"command": "fast"}],
+        [{"command": "other"}],
+    ]
+    assert server.connections == 1
+    assert not client._ws._pending
+
+
+async def test_reconnects_after_connection_drop(client, server):
+    """A dropped connection fails its waiters and the next command reconnects."""
+    assert await client._websocket_command("first") == [{"command": "first"}]
+
+    assert await client._websocket_command("drop") == []
+    assert not client._ws._pending
+
+    assert await client._websocket_command("second") == [{"command": "second"}]
+    assert server.connections == 2
+
+
+async def test_auth_invalid_returns_empty_result(monkeypatch, server):
+    """A rejected token fails the command without keeping the connection."""
+    monkeypatch.setattr(config, "supervisor_token", "wrong-token")
+    ha = HAClient()
+    try:
+        with pytest.raises(ConnectionError, match="Bad token"):
+            await ha._ws._ensure()
+        assert await ha._websocket_command("anything") == []
+        assert ha._ws._ws is None
+        assert not server.commands
+    finally:
+        await ha.close()
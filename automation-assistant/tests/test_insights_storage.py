@@ -0,0 +1,145 @@
+"""Tests for the insights store's in-memory index and delayed saves."""
+
+import asyncio
+import os
+
+import orjson
+import pytest
+
+from app.insights_storage import InsightsStorage, generate_insight_id
+
+
+def make_insight(automation_id: str, **extra) -> dict:
+    """Build a diagnosis insight for one automation."""
+    return {
+        "category": "single",
+        "insight_type": "error",
+        "automation_ids": [automation_id],
+        "affected_entities": [],
+        "title": f"Problem in {automation_id}",
+        **extra,
+    }
+
+
+def read_file(storage: InsightsStorage) -> list[dict]:
+    """Return the insights currently persisted on disk."""
+    return orjson.loads(storage.storage_file.read_bytes())["insights"]
+
+
+def write_file(storage: InsightsStorage, insights: list[dict]) -> None:
+    """Replace the file as an external editor would, with a newer mtime."""
+    storage.storage_file.write_bytes(orjson.dumps({"insights": insights}))
+    stat = storage.storage_file.stat()
+    os.utime(
+        storage.storage_file,
+        ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000),
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """An empty store in a temporary directory with a short save delay."""
+    store = InsightsStorage(storage_dir=str(tmp_path))
+    store.SAVE_DELAY_SECONDS = 0.05
+    return store
+
+
+async def test_saves_are_debounced(storage):
+    """A burst of changes is written once, after the delay."""
+    await storage.add_insights([make_insight("a")])
+    await storage.add_insights([make_insight("b")])
+    assert not storage.storage_file.exists()
+
+    await asyncio.sleep(storage.SAVE_DELAY_SECONDS * 4)
+
+    assert {i["automation_ids"][0] for i in read_file(storage)} == {"a", "b"}
+
+
+async def test_saves_early_once_enough_changes_are_pending(storage):
+    """Reaching SAVE_MAX_PENDING writes without waiting for the delay."""
+    storage.SAVE_DELAY_SECONDS = 60
+    storage.SAVE_MAX_PENDING = 2
+    await storage.add_insights([make_insight("a")])
+    await storage.add_insights([make_insight("b")])
+
+    await asyncio.wait_for(storage._save_task, timeout=5)
+
+    assert len(read_file(storage)) == 2
+
+
+async def test_flush_writes_pending_changes(storage):
+    """flush() persists right away and cancels the delayed save."""
+    storage.SAVE_DELAY_SECONDS = 60
+    await storage.add_insights([make_insight("a")])
+    save_task = storage._save_task
+
+    await storage.flush()
+
+    assert len(read_file(storage)) == 1
+    await asyncio.sleep(0)
+    assert save_task.cancelled()
+
+
+async def test_reloads_after_external_edit(storage):
+    """A file changed on disk is reloaded when nothing is pending."""
+    await storage.add_insights([make_insight("a")])
+    await storage.flush()
+    assert len(await storage.get_all()) == 1
+
+    edited = make_insight("b", last_seen="2024-01-01T00:00:00")
+    edited["insight_id"] = generate_insight_id(edited)
+    write_file(storage, read_file(storage) + [edited])
+
+    insights = await storage.get_all()
+    assert [i["automation_ids"][0] for i in insights] == ["a", "b"]
+    assert await storage.get_by_id(edited["insight_id"]) is not None
+
+
+async def test_migrates_legacy_ids(storage):
+    """Insights stored under an older ID scheme are re-keyed and saved."""
+    legacy = make_insight("a", insight_id="legacy-id", last_seen="2024-01-01T00:00:00")
+    write_file(storage, [legacy])
+
+    insights = await storage.get_all()
+    new_id = generate_insight_id(legacy)
+    assert [i["insight_id"] for i in insights] == [new_id]
+    assert await storage.get_by_id("legacy-id") is None
+
+    # Deduplicates against the same insight from a new diagnosis
+    assert await storage.add_insights([make_insight("a")]) == 0
+
+    await storage.flush()
+    assert [i["insight_id"] for i in read_file(storage)] == [new_id]
+
+
+async def test_read_views_follow_changes(storage):
+    """Cached category buckets and the unresolved count drop on every change."""
+    multi = make_insight("b", category="multi")
+    await storage.add_insights([make_insight("a"), multi])
+    assert await storage.get_unresolved_count() == 2
+    assert len(await storage.get_single_automation_insights()) == 1
+
+    await storage.mark_resolved(generate_insight_id(multi))
+    await storage.delete_insight(generate_insight_id(make_insight("a")))
+
+    assert await storage.get_unresolved_count() == 0
+    assert await storage.get_single_automation_insights() == []
+    assert [i["resolved"] for i in await storage.get_multi_automation_insights()] == [True]
+
+
+async def test_retention_evicts_old_resolved_and_caps_total(storage):
+    """Stale resolved insights are dropped and the oldest go past MAX_INSIGHTS."""
+    stale = [
+        make_insight("resolved", resolved=True, last_seen="2020-01-01T00:00:00"),
+        make_insight("open", resolved=False, last_seen="2020-01-01T00:00:00"),
+    ]
+    for insight in stale:
+        insight["insight_id"] = generate_insight_id(insight)
+    write_file(storage, stale)
+
+    await storage.add_insights([make_insight("new")])
+    assert [i["automation_ids"][0] for i in await storage.get_all()] == ["new", "open"]
+
+    storage.MAX_INSIGHTS = 2
+    await storage.add_insights([make_insight("newer")])
+    assert [i["automation_ids"][0] for i in await storage.get_all()] == ["newer", "new"]
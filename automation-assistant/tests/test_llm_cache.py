@@ -0,0 +1,96 @@
+"""Tests for the LLM response cache."""
+
+import asyncio
+
+import pytest
+
+from app.llm.cache import ResponseCache
+
+
+class SlowCompute:
+    """Counts calls and returns after a short delay."""
+
+    def __init__(self, result: str = "response"):
+        self.calls = 0
+        self.result = result
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return self.result
+
+
+async def test_caches_responses():
+    """A second request for the same key reuses the first response."""
+    cache = ResponseCache(ttl_seconds=60)
+    compute = SlowCompute()
+
+    assert await cache.get_or_compute("key", compute) == "response"
+    assert await cache.get_or_compute("key", compute) == "response"
+    assert compute.calls == 1
+
+
+async def test_coalesces_in_flight_requests():
+    """Identical concurrent requests share one call."""
+    cache = ResponseCache(ttl_seconds=60)
+    compute = SlowCompute()
+
+    results = await asyncio.gather(
+        *(cache.get_or_compute("key", compute) for _ in range(3))
+    )
+
+    assert results == ["response"] * 3
+    assert compute.calls == 1
+
+
+async def test_cancelled_originator_does_not_cancel_waiters():
+    """Cancelling the first caller leaves the call running for the others."""
+    cache = ResponseCache(ttl_seconds=60)
+    compute = SlowCompute()
+
+    originator = asyncio.create_task(cache.get_or_compute("key", compute))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_compute("key", compute))
+    await asyncio.sleep(0.01)
+
+    originator.cancel()
+
+    assert await waiter == "response"
+    with pytest.raises(asyncio.CancelledError):
+        await originator
+    assert compute.calls == 1
+    assert await cache.get_or_compute("key", compute) == "response"
+    assert compute.calls == 1
+
+
+async def test_errors_reach_waiters_and_are_not_cached():
+    """A failed call raises for every caller and the next one retries."""
+    cache = ResponseCache(ttl_seconds=60)
+    calls = 0
+
+    async def failing() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        cache.get_or_compute("key", failing),
+        cache.get_or_compute("key", failing),
+        return_exceptions=True,
+    )
+
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert calls == 1
+    assert await cache.get_or_compute("key", SlowCompute()) == "response"
+
+
+async def test_disabled_cache_always_computes():
+    """A zero TTL turns caching and coalescing off."""
+    cache = ResponseCache(ttl_seconds=0)
+    compute = SlowCompute()
+
+    await cache.get_or_compute("key", compute)
+    await cache.get_or_compute("key", compute)
+
+    assert compute.calls == 2
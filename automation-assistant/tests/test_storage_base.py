@@ -0,0 +1,65 @@
+"""Tests for the shared JSON storage load cache."""
+
+import os
+
+import orjson
+import pytest
+
+from app.storage_base import JsonStorageBase
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A store over a temporary file holding one item."""
+    storage = JsonStorageBase(
+        storage_dir=str(tmp_path), filename="data.json", default_data={"items": []}
+    )
+    storage.storage_file.write_bytes(orjson.dumps({"items": [1]}))
+    return storage
+
+
+def edit_file(store: JsonStorageBase, data: dict) -> None:
+    """Rewrite the file behind the store's back, with a newer mtime."""
+    store.storage_file.write_bytes(orjson.dumps(data))
+    stat = store.storage_file.stat()
+    os.utime(store.storage_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_reuses_parsed_data_until_file_changes(store):
+    """Unchanged files are not re-parsed; an external edit is picked up."""
+    first = store._load_data()
+    assert store._load_data() is first
+
+    edit_file(store, {"items": [1, 2]})
+
+    assert store._load_data() == {"items": [1, 2]}
+
+
+def test_save_refreshes_cache(store):
+    """Saved data is served from memory without reading it back."""
+    data = store._load_data()
+    data["items"].append(2)
+    store._save_data_sync(data, durable=False)
+
+    assert store._load_data() is data
+    assert orjson.loads(store.storage_file.read_bytes()) == {"items": [1, 2]}
+
+
+def test_cache_can_be_turned_off(store):
+    """With CACHE_LOADS off every load parses the file again."""
+    store.CACHE_LOADS = False
+
+    first = store._load_data()
+
+    assert store._load_data() is not first
+    assert store._cached is None
+
+
+def test_missing_file_returns_fresh_default(store):
+    """A missing file yields a copy of the default payload, never cached."""
+    store.storage_file.unlink()
+
+    data = store._load_data()
+    data["items"].append(1)
+
+    assert store._load_data() == {"items": []}